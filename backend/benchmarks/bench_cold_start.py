@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark backend cold start: time for a fresh worker process to import the app
+
+Each round starts a new interpreter, as a new worker or autoscaled replica would, and
+measures:
+  - lazy: `import main` as shipped (OpenAI SDK, smtplib/email and python-dotenv deferred)
+  - eager: the same with those modules imported up front, as main.py used to
+  - the deferred cost paid on first use: creating the OpenAI client
+
+It also lists the slowest imports reported by `python -X importtime`.
+
+Usage:
+    cd backend
+    python benchmarks/bench_cold_start.py [--rounds 10] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EAGER_IMPORTS = "import openai, smtplib, email.mime.multipart, email.mime.text, dotenv"
+
+MEASURE = """
+import sys, time
+started = time.perf_counter()
+{pre_imports}
+import main
+imported = time.perf_counter()
+modules = len(sys.modules)
+main.get_openai_client()
+client_ready = time.perf_counter()
+print(imported - started, client_ready - imported, modules)
+"""
+
+def run_python(code, *flags):
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark")}
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return result
+
+def measure(pre_imports, rounds):
+    """Return the import and client creation times (seconds) of `rounds` fresh processes"""
+    import_times, client_times = [], []
+    modules = 0
+    for _ in range(rounds):
+        fields = run_python(MEASURE.format(pre_imports=pre_imports)).stdout.split()
+        import_times.append(float(fields[0]))
+        client_times.append(float(fields[1]))
+        modules = int(fields[2])
+    return import_times, client_times, modules
+
+def slowest_imports(top):
+    """Parse `python -X importtime -c 'import main'` into the slowest modules main imports directly"""
+    stderr = run_python("import main", "-X", "importtime").stderr
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.rstrip()[1:]  # Drop the separator space; the rest of the indent is the depth
+        if name.startswith("  ") and not name.startswith("    "):
+            packages[name.strip()] = int(cumulative) / 1000
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend cold start")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.rounds} fresh processes per variant (median, min)\n")
+    results = {}
+    for label, pre_imports in (("eager", EAGER_IMPORTS), ("lazy", "")):
+        import_times, client_times, modules = measure(pre_imports, args.rounds)
+        results[label] = statistics.median(import_times)
+        print(f"{label:>6}: import main {statistics.median(import_times) * 1000:7.1f} ms "
+              f"(min {min(import_times) * 1000:.1f}), {modules} modules loaded, "
+              f"first OpenAI client {statistics.median(client_times) * 1000:.1f} ms")
+    print(f"\nimport main is {(1 - results['lazy'] / results['eager']) * 100:.0f}% faster with lazy imports")
+
+    print("\nSlowest imports of `import main` (cumulative ms):")
+    for name, milliseconds in slowest_imports(args.top):
+        print(f"  {milliseconds:8.1f}  {name}")
+
+if __name__ == "__main__":
+    main()
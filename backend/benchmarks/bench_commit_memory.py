@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of commit pagination: full GitHub JSON vs compact records
+
+Serves 1000 synthetic commits shaped like the GitHub REST API response (author and
+committer objects, URLs, verification blocks) from an in-process stand-in and compares
+the legacy approach (extend the full JSON of every page, then regex-match per ticket)
+with fetch_matching_commits, which projects each page into compact records as it is
+parsed. Peak memory is measured with tracemalloc.
+
+Usage:
+    cd backend
+    python benchmarks/bench_commit_memory.py [--tickets 5] [--rounds 3]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("GITHUB_OWNER", "acme")
+
+import main  # noqa: E402
+
+TOTAL_COMMITS = 1000
+
+def github_user(i):
+    login = f"developer-{i % 25}"
+    return {
+        "login": login,
+        "id": 1000 + i % 25,
+        "node_id": "MDQ6VXNlcjEwMDA=",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{1000 + i % 25}?v=4",
+        "url": f"https://api.github.com/users/{login}",
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"https://api.github.com/users/{login}/followers",
+        "repos_url": f"https://api.github.com/users/{login}/repos",
+        "events_url": f"https://api.github.com/users/{login}/events{{/privacy}}",
+        "type": "User",
+        "site_admin": False,
+    }
+
+def github_commit(i):
+    sha = f"{i:040x}"
+    url = f"https://api.github.com/repos/acme/webstore/commits/{sha}"
+    signature = {"name": f"Developer {i % 25}", "email": f"dev{i % 25}@example.com", "date": "2026-01-01T00:00:00Z"}
+    return {
+        "sha": sha,
+        "node_id": "C_kwDOAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA",
+        "commit": {
+            "author": signature,
+            "committer": signature,
+            "message": f"[PROJ-{i % 40}] Change number {i}\n\nLonger description of the change explaining the reasoning.",
+            "tree": {"sha": f"{i + 1:040x}", "url": url.replace("/commits/", "/git/trees/")},
+            "url": url.replace("/commits/", "/git/commits/"),
+            "comment_count": 0,
+            "verification": {"verified": True, "reason": "valid", "signature": "-----BEGIN PGP SIGNATURE-----\n" + "A" * 400, "payload": "tree " + "b" * 200},
+        },
+        "url": url,
+        "html_url": f"https://github.com/acme/webstore/commit/{sha}",
+        "comments_url": f"{url}/comments",
+        "author": github_user(i),
+        "committer": github_user(i + 1),
+        "parents": [{"sha": f"{i - 1:040x}", "url": url, "html_url": url}],
+    }
+
+class StandInResponse:
+    """Mimics requests.Response: the body is parsed from raw bytes on .json()"""
+    status_code = 200
+    text = ""
+
+    def __init__(self, body: bytes):
+        self.content = body
+
+    def json(self):
+        return json.loads(self.content)
+
+def make_stand_in(pages):
+    def get(url, headers=None, params=None, **kwargs):
+        page = (params or {}).get("page", 1)
+        return StandInResponse(pages[page - 1] if page <= len(pages) else b"[]")
+    return get
+
+def legacy_fetch(ticket_keys):
+    """The pre-optimization pipeline: keep every commit's full JSON, then match per ticket"""
+    all_commits = []
+    page = 1
+    while True:
+        batch = main.requests.get("commits", params={"per_page": 100, "page": page}).json()
+        if not batch:
+            break
+        all_commits.extend(batch)
+        if len(batch) < 100:
+            break
+        page += 1
+        if page > 10:
+            break
+    matching = []
+    for ticket_key in ticket_keys:
+        pattern = rf"^\[{re.escape(ticket_key)}\]"
+        matching.extend(c for c in all_commits if re.match(pattern, c['commit']['message']))
+    return list({c['sha']: c for c in matching}.values())
+
+def compact_fetch(ticket_keys):
+    matching, _ = main.fetch_matching_commits("webstore", ticket_keys, {})
+    return matching
+
+def measure(fn, ticket_keys, rounds):
+    best_time = float("inf")
+    peak = 0
+    for _ in range(rounds):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn(ticket_keys)
+        elapsed = time.perf_counter() - start
+        _, round_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        best_time = min(best_time, elapsed)
+        peak = max(peak, round_peak)
+        del result
+    return peak, best_time
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tickets", type=int, default=5, help="Number of requested tickets")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per approach (best time, max peak)")
+    args = parser.parse_args()
+
+    main.logger.disabled = True
+    commits = [github_commit(i) for i in range(TOTAL_COMMITS)]
+    pages = [json.dumps(commits[i:i + 100]).encode() for i in range(0, TOTAL_COMMITS, 100)]
+    del commits
+    main.requests.get = make_stand_in(pages)
+    ticket_keys = [f"PROJ-{i}" for i in range(args.tickets)]
+
+    print(f"{TOTAL_COMMITS} commits, {sum(len(p) for p in pages) / 1024:.0f} KiB of JSON, {len(ticket_keys)} tickets")
+    results = {}
+    for name, fn in (("legacy (full JSON)", legacy_fetch), ("compact records", compact_fetch)):
+        peak, elapsed = measure(fn, ticket_keys, args.rounds)
+        results[name] = peak
+        print(f"{name:<20} peak {peak / 1024 / 1024:7.2f} MiB   time {elapsed * 1000:7.1f} ms")
+
+    legacy_peak, compact_peak = results.values()
+    print(f"Peak memory reduced {legacy_peak / compact_peak:.1f}x")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark debug endpoint payloads: serialization time and size on the wire
+
+Builds a synthetic generate-release-note-debug response (many commits with large
+patches) and compares:
+  - the previous path: FastAPI's jsonable_encoder + stdlib JSONResponse
+  - direct JSONResponseClass rendering (orjson when installed)
+  - gzip at the middleware's compression level
+  - field projection: no patches, and patches limited to N lines per file
+
+Usage:
+    cd backend
+    python benchmarks/bench_debug_payload.py [--commits 150] [--files 8] [--patch-lines 120]
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("GITHUB_OWNER", "acme")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import main  # noqa: E402
+
+def synthetic_patch(seed, patch_lines):
+    """A patch whose lines differ per commit and file, so gzip ratios stay realistic"""
+    lines = ["@@ -1,1 +1,1 @@"]
+    for i in range(patch_lines):
+        token = hashlib.sha1(f"{seed}:{i}".encode()).hexdigest()
+        lines.append(f"{'+- '[i % 3]}    {token[:8]} = compute_{token[8:14]}({token[14:22]}, option={token[22:26]})  # {token[26:]}")
+    return "\n".join(lines)
+
+def synthetic_payload(commits, files, patch_lines):
+    commit_diffs = [
+        {
+            "sha": f"{c:040x}",
+            "message": f"[PROJ-{c % 3}] Change number {c}",
+            "committed_at": "2026-01-01T00:00:00Z",
+            "files": [{"filename": f"src/module_{c}/file_{f}.py", "patch": synthetic_patch(f"{c}:{f}", patch_lines)} for f in range(files)],
+            "repo": "webstore",
+        }
+        for c in range(commits)
+    ]
+    return {
+        "jira_tickets": [{"key": f"PROJ-{i}", "summary": "Summary", "description": "Description " * 50} for i in range(3)],
+        "failed_tickets": [],
+        "ticket_commit_counts": {f"PROJ-{i}": commits // 3 for i in range(3)},
+        "repo_commit_counts": {"webstore": commits},
+        "commit_diffs": commit_diffs,
+    }
+
+def timed(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def row(label, body, elapsed):
+    compressed, gzip_time = timed(lambda: gzip.compress(body, compresslevel=main.settings.response_gzip_level), 1)
+    print(f"{label:<42} {len(body) / 1024:>9.0f} KiB  {len(compressed) / 1024:>8.0f} KiB gzip  "
+          f"serialize {elapsed * 1000:>7.1f} ms  gzip {gzip_time * 1000:>6.1f} ms")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--commits", type=int, default=150)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--patch-lines", type=int, default=120)
+    parser.add_argument("--limit-lines", type=int, default=20, help="max_patch_lines for the projection row")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = synthetic_payload(args.commits, args.files, args.patch_lines)
+    encoder = "orjson" if main.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"{args.commits} commits x {args.files} files x {args.patch_lines} patch lines, encoder: {encoder}\n")
+
+    body, elapsed = timed(lambda: JSONResponse(jsonable_encoder(payload)).body, args.rounds)
+    row("before: jsonable_encoder + JSONResponse", body, elapsed)
+
+    body, elapsed = timed(lambda: main.JSONResponseClass(payload).body, args.rounds)
+    row("after: JSONResponseClass", body, elapsed)
+
+    def projected(include_patches, max_patch_lines):
+        return {**payload, "commit_diffs": main.project_commit_diffs(payload["commit_diffs"], include_patches, max_patch_lines)}
+
+    body, elapsed = timed(lambda: main.JSONResponseClass(projected(True, args.limit_lines)).body, args.rounds)
+    row(f"after: max_patch_lines={args.limit_lines}", body, elapsed)
+
+    body, elapsed = timed(lambda: main.JSONResponseClass(projected(False, None)).body, args.rounds)
+    row("after: include_patches=false", body, elapsed)
+
+if __name__ == "__main__":
+    main_cli()
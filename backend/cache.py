@@ -0,0 +1,413 @@
+"""
+Pluggable cache for upstream data (JIRA tickets, commit diffs, repository listings)
+
+Backends:
+    memory  - per-process dictionary (default)
+    sqlite  - shared on-disk store, usable by every worker process on the host
+    redis   - any Redis-compatible server, shared across hosts (no client library needed)
+    none    - caching disabled
+
+Values are stored as JSON. `get_or_set` protects against cache stampedes: within a
+process concurrent misses for the same key are coalesced, and across processes a
+short-lived lock key lets one worker load the value while the others wait for it. Waiters
+stop as soon as the lock is released without a value (the loader failed or returned None)
+or the request deadline is up.
+"""
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend:
+    """Base class: subclasses implement get/set/add/delete on JSON strings"""
+
+    # Stampede protection settings
+    lock_ttl = 30  # Seconds a loader may hold the lock before others take over
+    lock_wait = 10  # Seconds to wait for another worker's result before loading anyway
+    poll_interval = 0.05
+
+    def __init__(self):
+        self._key_locks: Dict[str, List] = {}  # key -> [lock, number of users]
+        self._key_locks_guard = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _set(self, key: str, payload: str, ttl: float):
+        raise NotImplementedError
+
+    def _add(self, key: str, payload: str, ttl: float) -> bool:
+        """Set the key only if it does not exist; return whether it was set"""
+        raise NotImplementedError
+
+    def _delete_if(self, key: str, payload: str):
+        """Delete the key only if it still holds payload"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    @contextmanager
+    def _key_lock(self, key: str, timeout: float):
+        """Hold the in-process lock of one key; yields whether it was acquired within timeout"""
+        with self._key_locks_guard:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(timeout=timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            with self._key_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[key]
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None on a miss"""
+        try:
+            payload = self._get(key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        try:
+            self._set(key, json.dumps(value), ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """
+        Set the key only if it does not exist; return whether it was set
+
+        Fails open: returns True when the cache is unavailable.
+        """
+        try:
+            return self._add(key, json.dumps(value), ttl)
+        except Exception as e:
+            logger.warning(f"Cache add failed for {key}: {str(e)}")
+            return True
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: float, deadline=None) -> Any:
+        """
+        Return the cached value for key, loading and caching it on a miss
+
+        The loader is not cached when it returns None or raises. Waiting for another
+        loader of the same key ends when `deadline` (a hedging.Deadline) is up; the loader
+        is then called anyway and is expected to respect the same deadline.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        # Coalesce concurrent misses in this process
+        with self._key_lock(key, self._wait_time(deadline)) as locked:
+            if locked:
+                value = self.get(key)
+                if value is not None:
+                    return value
+
+            # Coalesce concurrent misses across worker processes
+            lock_key = f"lock:{key}"
+            token = json.dumps(uuid.uuid4().hex)
+            try:
+                acquired = self._add(lock_key, token, self.lock_ttl)
+            except Exception as e:
+                logger.warning(f"Cache lock failed for {key}: {str(e)}")
+                acquired = False
+
+            if not acquired:
+                value = self._wait_for_value(key, lock_key, deadline)
+                if value is not None:
+                    return value
+
+            try:
+                value = loader()
+                if value is not None:
+                    self.set(key, value, ttl)
+                return value
+            finally:
+                if acquired:
+                    try:
+                        # Only release our own lock, not one taken over after lock_ttl
+                        self._delete_if(lock_key, token)
+                    except Exception as e:
+                        logger.warning(f"Cache unlock failed for {key}: {str(e)}")
+
+    def _wait_time(self, deadline) -> float:
+        remaining = deadline.remaining() if deadline is not None else None
+        return self.lock_wait if remaining is None else min(self.lock_wait, remaining)
+
+    def _wait_for_value(self, key: str, lock_key: str, deadline) -> Any:
+        """Poll for the value another worker is loading; None once its lock is gone or time is up"""
+        wait_until = time.monotonic() + self._wait_time(deadline)
+        while time.monotonic() < wait_until:
+            time.sleep(self.poll_interval)
+            value = self.get(key)
+            if value is not None:
+                logger.info(f"Cache filled by another worker: {key}")
+                return value
+            try:
+                if self._get(lock_key) is None:
+                    return None  # Released without a value: the other loader failed or found nothing
+            except Exception as e:
+                logger.warning(f"Cache lock check failed for {key}: {str(e)}")
+                return None
+        logger.warning(f"Timed out waiting for another worker to fill {key}, loading it here")
+        return None
+
+class NullCache(CacheBackend):
+    """Caching disabled: every lookup is a miss"""
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, payload, ttl):
+        pass
+
+    def _add(self, key, payload, ttl):
+        return True
+
+    def _delete_if(self, key, payload):
+        pass
+
+    def delete(self, key):
+        pass
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live_entry(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._live_entry(key, time.monotonic())
+            return entry[1] if entry else None
+
+    def _set(self, key, payload, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _add(self, key, payload, ttl):
+        with self._lock:
+            if self._live_entry(key, time.monotonic()) is not None:
+                return False
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            return True
+
+    def _delete_if(self, key, payload):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == payload:
+                del self._entries[key]
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class SQLiteCache(CacheBackend):
+    """
+    Shared on-disk cache in a SQLite database (WAL mode)
+
+    Every worker process on the host opens the same file, so a value fetched by one
+    worker is served to all of them.
+    """
+
+    purge_interval = 300  # Seconds between deletions of expired rows
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        self._purged_at = time.monotonic()
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_by_expiry ON cache (expires_at)")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key, payload, ttl):
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, payload, time.time() + ttl)
+        )
+        # Expired rows are skipped by reads but never overwritten (diffs are keyed per SHA)
+        if time.monotonic() - self._purged_at >= self.purge_interval:
+            self._purged_at = time.monotonic()
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def _add(self, key, payload, ttl):
+        connection = self._connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, now + ttl)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def _delete_if(self, key, payload):
+        self._connect().execute("DELETE FROM cache WHERE key = ? AND value = ?", (key, payload))
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+# Atomically delete a key only if it holds the given value
+DELETE_IF_SCRIPT = "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) else return 0 end"
+
+class RedisCache(CacheBackend):
+    """
+    Cache on a Redis-compatible server, spoken to over RESP directly
+
+    Only GET, SET (EX/NX), DEL and one EVAL script (compare-and-delete of stampede locks)
+    are used, so Redis, Valkey, KeyDB or a local stand-in all work. Each thread keeps its own connection and reconnects after errors.
+    """
+
+    def __init__(self, url: str, socket_timeout: float = 2.0):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.socket_timeout = socket_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.socket_timeout)
+            connection = (sock, sock.makefile("rb"))
+            self._local.connection = connection
+            if self.password:
+                self._call("AUTH", *([self.username] if self.username else []), self.password)
+            if self.db:
+                self._call("SELECT", str(self.db))
+        return connection
+
+    def _reset(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            connection[1].close()
+            connection[0].close()
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        kind, data = line[:1], line[1:-2]
+        if kind == b"+":
+            return data.decode()
+        if kind == b"-":
+            raise RuntimeError(data.decode())
+        if kind == b":":
+            return int(data)
+        if kind == b"$":
+            length = int(data)
+            if length < 0:
+                return None
+            payload = reader.read(length + 2)
+            return payload[:-2].decode("utf-8")
+        if kind == b"*":
+            count = int(data)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line!r}")
+
+    def _call(self, *args):
+        sock, reader = self._connection()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            encoded = arg.encode("utf-8") if isinstance(arg, str) else arg
+            parts.append(f"${len(encoded)}\r\n".encode() + encoded + b"\r\n")
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except (OSError, ConnectionError):
+            self._reset()
+            raise
+
+    def _get(self, key):
+        return self._call("GET", key)
+
+    def _set(self, key, payload, ttl):
+        self._call("SET", key, payload, "EX", str(max(1, int(ttl))))
+
+    def _add(self, key, payload, ttl):
+        return self._call("SET", key, payload, "NX", "EX", str(max(1, int(ttl)))) == "OK"
+
+    def _delete_if(self, key, payload):
+        self._call("EVAL", DELETE_IF_SCRIPT, "1", key, payload)
+
+    def delete(self, key):
+        self._call("DEL", key)
+
+def create_cache(backend: str, url: Optional[str] = None) -> CacheBackend:
+    """
+    Create a cache backend by name
+
+    Args:
+        backend: "memory", "sqlite", "redis" or "none"
+        url: SQLite database path or redis:// URL
+    """
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "sqlite":
+        return SQLiteCache(url or "cache.db")
+    if backend == "redis":
+        return RedisCache(url or "redis://localhost:6379/0")
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend '{backend}'. Use memory, sqlite, redis or none.")
@@ -0,0 +1,165 @@
+"""
+Persistent ticket -> commit index for GitHub repositories
+
+Commits are indexed by the `[TICKET-KEY]` prefix of their message, so the commits of a
+ticket can be looked up directly instead of paginating the repository history. The index
+is fed by GitHub push webhooks and backfilled with incremental `since=` syncs.
+"""
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Matches the `[TICKET-KEY]` prefix of a commit message
+TICKET_PREFIX_PATTERN = re.compile(r"^\[([^\]\n]+)\]")
+
+def parse_ticket_key(message: str) -> Optional[str]:
+    """
+    Extract the ticket key from a commit message of the form `[TICKET-KEY] message`
+
+    Returns:
+        str: The ticket key, or None if the message has no ticket prefix
+    """
+    match = TICKET_PREFIX_PATTERN.match(message or "")
+    return match.group(1) if match else None
+
+def normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize an ISO 8601 timestamp to UTC `YYYY-MM-DDTHH:MM:SSZ`
+
+    GitHub's REST API uses UTC `Z` timestamps while push webhooks carry local offsets;
+    normalizing them lets the index compare and sort timestamps as strings.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class CommitIndex:
+    """
+    Inverted index of ticket key -> commit SHAs per repository, stored in SQLite
+
+    The database is opened lazily on first use and in WAL mode, so several worker
+    processes can share the same index file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS commits (
+                    repo TEXT NOT NULL,
+                    sha TEXT NOT NULL,
+                    ticket_key TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    committed_at TEXT,
+                    PRIMARY KEY (repo, sha)
+                );
+                CREATE INDEX IF NOT EXISTS commits_by_ticket ON commits (repo, ticket_key);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    repo TEXT PRIMARY KEY,
+                    last_synced_at TEXT NOT NULL
+                );
+            """)
+            self._connection = connection
+        return self._connection
+
+    def add_commits(self, repo: str, commits: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Index commits of a repository, skipping the ones without a ticket prefix
+
+        Args:
+            repo: Repository name
+            commits: (sha, message, committed_at) tuples
+
+        Returns:
+            int: Number of commits with a ticket prefix that were indexed
+        """
+        rows = []
+        for sha, message, committed_at in commits:
+            ticket_key = parse_ticket_key(message)
+            if ticket_key:
+                rows.append((repo, sha, ticket_key, message, normalize_timestamp(committed_at)))
+
+        if rows:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO commits (repo, sha, ticket_key, message, committed_at) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+        return len(rows)
+
+    def lookup(self, repo: str, ticket_keys: List[str], since: Optional[str] = None,
+               until: Optional[str] = None) -> Dict[str, List[Tuple[str, str, Optional[str]]]]:
+        """
+        Look up the commits of each ticket in a repository, newest first
+
+        Args:
+            repo: Repository name
+            ticket_keys: Ticket keys to look up
+            since: Only return commits at or after this UTC timestamp
+            until: Only return commits at or before this UTC timestamp
+
+        Returns:
+            dict: ticket key -> list of (sha, message, committed_at)
+        """
+        keys = list(dict.fromkeys(ticket_keys))
+        result = {key: [] for key in keys}
+        if not keys:
+            return result
+
+        query = f"SELECT ticket_key, sha, message, committed_at FROM commits WHERE repo = ? AND ticket_key IN ({', '.join('?' for _ in keys)})"
+        params = [repo, *keys]
+        if since:
+            query += " AND committed_at >= ?"
+            params.append(normalize_timestamp(since))
+        if until:
+            query += " AND committed_at <= ?"
+            params.append(normalize_timestamp(until))
+        query += " ORDER BY committed_at DESC"
+
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+
+        for ticket_key, sha, message, committed_at in rows:
+            result[ticket_key].append((sha, message, committed_at))
+        return result
+
+    def get_last_synced_at(self, repo: str) -> Optional[str]:
+        """Return the ISO 8601 timestamp of the last completed sync, or None if never synced"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT last_synced_at FROM sync_state WHERE repo = ?", (repo,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_last_synced_at(self, repo: str, synced_at: str):
+        """Record the timestamp the next incremental sync of a repository starts from"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO sync_state (repo, last_synced_at) VALUES (?, ?)",
+                    (repo, synced_at)
+                )
+
+    def is_synced(self, repo: str) -> bool:
+        """Whether the repository has been backfilled and can be served from the index"""
+        return self.get_last_synced_at(repo) is not None
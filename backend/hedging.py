@@ -0,0 +1,139 @@
+"""
+Request deadlines and hedged calls
+
+A Deadline is created when a request arrives and passed down the pipeline, so every
+upstream call gets a timeout bounded by the time the request has left. hedged_call runs
+a call and, if it is slow or fails, starts a backup call and keeps whichever succeeds first.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared by all hedged calls; losing calls keep running here until their own timeout
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedged-call")
+
+class DeadlineExceeded(TimeoutError):
+    """The request ran out of time before an upstream call finished"""
+
+class Deadline:
+    """A point in time by which a request must finish (None: no deadline)"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None if there is no deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        Timeout for the next upstream call: the time left, capped at `cap`
+
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceeded("Request deadline exceeded")
+        return min(remaining, cap) if cap else remaining
+
+class LatencyTracker:
+    """Rolling window of call latencies, used to pick the hedge delay"""
+
+    def __init__(self, window: int = 100):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+    def hedge_delay(self, p: float, default: float, minimum: float, min_samples: int = 10) -> float:
+        """The p-th percentile latency once enough samples exist, else the default"""
+        with self._lock:
+            sample_count = len(self._samples)
+        if sample_count < min_samples:
+            return default
+        return max(minimum, self.percentile(p))
+
+def hedged_call(calls: List[Callable[[], object]], hedge_delay: Optional[float], deadline: Deadline):
+    """
+    Run calls[0]; start the next call when the running ones fail or take longer than hedge_delay
+
+    Args:
+        calls: Primary call followed by backup calls (e.g. a duplicate or a fallback provider)
+        hedge_delay: Seconds to wait before starting a backup while the others are still
+            running, or None to start backups only after failures
+        deadline: Request deadline bounding the whole operation
+
+    Returns:
+        The result of the first call that succeeds
+
+    Raises:
+        DeadlineExceeded: If no call succeeds before the deadline
+        Exception: The last error if every call fails
+    """
+    pending = set()
+    next_call = 0
+    last_error = None
+
+    def start_next():
+        nonlocal next_call
+        future = _executor.submit(calls[next_call])
+        future.call_index = next_call
+        pending.add(future)
+        next_call += 1
+
+    start_next()
+    while pending:
+        remaining = deadline.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded("Request deadline exceeded")
+        timeout = remaining
+        can_hedge = hedge_delay is not None and next_call < len(calls)
+        if can_hedge:
+            timeout = hedge_delay if timeout is None else min(timeout, hedge_delay)
+
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        failed = False
+        for future in done:
+            pending.discard(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Call {future.call_index} failed: {str(e)}")
+                last_error = e
+                failed = True
+                continue
+            if future.call_index > 0:
+                logger.info(f"Backup call {future.call_index} finished first")
+            return result
+
+        if next_call < len(calls):
+            if failed:
+                logger.info(f"Starting backup call {next_call} after a failure")
+                start_next()
+            elif not done and can_hedge:
+                logger.info(f"Call still running after {hedge_delay:.1f}s, starting backup call {next_call}")
+                start_next()
+
+    raise last_error
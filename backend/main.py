@@ -1,35 +1,67 @@
 import logging
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from dotenv import load_dotenv
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 import os
 import requests
-import re
 import base64
+import hashlib
+import hmac
 import json
-from typing import List
-from openai import OpenAI
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from cache import create_cache
+from commit_index import CommitIndex, parse_ticket_key
+from hedging import Deadline, DeadlineExceeded, LatencyTracker, hedged_call
+from prewarm import BudgetExhausted, PrewarmScheduler, RequestBudget
+from prompt_templates import PromptTemplateRegistry
+from settings import Settings, load_env_file
 
-load_dotenv()
+try:
+    import orjson  # Optional: faster JSON serialization of large responses
+except ImportError:
+    orjson = None
 
-JIRA_TOKEN = os.getenv("JIRA_TOKEN")
-JIRA_EMAIL = os.getenv("JIRA_EMAIL")
-JIRA_BASE_URL = os.getenv("JIRA_BASE_URL")
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-GITHUB_OWNER = os.getenv("GITHUB_OWNER")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Configuration is parsed and validated once, at startup
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+load_env_file(BASE_DIR)
+settings = Settings.from_env()
 
-# Email configuration
-EMAIL_SMTP_SERVER = os.getenv("EMAIL_SMTP_SERVER", "smtp.gmail.com")
-EMAIL_SMTP_PORT = int(os.getenv("EMAIL_SMTP_PORT", "587"))
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")  # App password for JIRA_EMAIL
+JIRA_TICKET_PLACEHOLDER = "<PASTE_JIRA_TICKET_CONTENT_HERE>"
+GIT_DIFFS_PLACEHOLDER = "<PASTE_GIT_DIFFS_HERE>"
+JIRA_ISSUE_FIELDS = "summary,description,status,priority,assignee,reporter,created,updated,issuetype"
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# OpenAI clients, created on first use so workers boot without importing the SDK
+client = None
+fallback_client = None  # Optional fallback provider/model, raced against the primary when it is slow or erroring
+openai_clients_lock = threading.Lock()
+openai_semaphore = threading.BoundedSemaphore(settings.openai_max_concurrency)
+
+# Recent OpenAI latencies, used to pick the hedge delay
+openai_latency = LatencyTracker()
+
+# Prompt templates, loaded once and reloaded when the files change
+prompt_templates = PromptTemplateRegistry(
+    os.path.join(BASE_DIR, settings.prompt_template_path),
+    os.path.join(BASE_DIR, settings.prompt_templates_dir),
+    [JIRA_TICKET_PLACEHOLDER, GIT_DIFFS_PLACEHOLDER],
+    check_interval=settings.prompt_template_check_interval
+)
+
+# Cache for JIRA tickets, commit diffs and repository listings, optionally shared across workers
+cache = create_cache(settings.cache_backend, settings.cache_url)
+
+# Webhook-fed ticket -> commit index (opened lazily on first use)
+commit_index = CommitIndex(settings.commit_index_path)
 
 def convert_adf_to_text(adf_content):
     """
@@ -95,7 +127,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Serialize responses with orjson when it is installed
+JSONResponseClass = ORJSONResponse if orjson is not None else JSONResponse
+
+def dumps_json(value) -> bytes:
+    """Serialize a value to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (`gzip;q=0` refuses it)"""
+    for token in accept_encoding.split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        params = params.strip()
+        if not params.startswith("q="):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips clients refusing gzip with a zero q-value"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not accepts_gzip(Headers(scope=scope).get("Accept-Encoding", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown hooks (the hook functions are defined with the features they belong to)"""
+    report_missing_settings()
+    start_prewarming()
+    yield
+    stop_prewarming()
+
+app = FastAPI(default_response_class=JSONResponseClass, lifespan=lifespan)
+
+# Compress responses for clients sending Accept-Encoding: gzip
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=settings.response_gzip_min_size, compresslevel=settings.response_gzip_level)
 
 app.add_middleware(
     CORSMiddleware,
@@ -105,16 +181,131 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class GenerateReleaseNoteRequest(BaseModel):
-    repo: str
+class ReleaseNoteScope(BaseModel):
+    """What a release note covers; shared by single requests and batch jobs"""
+    repo: Optional[str] = None  # Single repository (kept for backwards compatibility)
+    repos: List[str] = []  # Multiple repositories combined into one release note
     jira_tickets: List[str]  # Changed to support multiple tickets
+    since: Optional[datetime] = None  # Only consider commits after this time (ISO 8601)
+    until: Optional[datetime] = None  # Only consider commits before this time (ISO 8601)
+    stop_when_matched: bool = False  # Stop paginating once every ticket has a matching commit
+    template: Optional[str] = None  # Prompt template override (defaults to the repository of single-repo requests)
+    # Response projection, so clients can ask for just what they render
+    fields: Optional[List[str]] = None  # Top-level response fields to return (default: all)
+
+    def repo_list(self) -> List[str]:
+        """Return the requested repositories, de-duplicated and in request order"""
+        repos = ([self.repo] if self.repo else []) + list(self.repos)
+        return list(dict.fromkeys(r.strip() for r in repos if r and r.strip()))
+
+class GenerateReleaseNoteRequest(ReleaseNoteScope):
+    include_patches: bool = True  # Debug endpoint: include the patch of each changed file
+    max_patch_lines: Optional[int] = Field(None, ge=0)  # Debug endpoint: truncate each patch to this many lines
+    deadline_seconds: Optional[float] = Field(None, gt=0)  # Overrides REQUEST_DEADLINE_SECONDS for this request
+
+class BatchReleaseNoteJob(ReleaseNoteScope):
+    # Per-request options (deadline_seconds, debug patch options) are rejected rather than ignored
+    model_config = ConfigDict(extra="forbid")
+
+    job_id: Optional[str] = None  # Defaults to the job's position in the batch
+
+class BatchReleaseNoteRequest(BaseModel):
+    jobs: List[BatchReleaseNoteJob]
+    stream: bool = False  # Stream one NDJSON line per job as each finishes
+    deadline_seconds: Optional[float] = Field(None, gt=0)  # Deadline for the whole batch (default REQUEST_DEADLINE_SECONDS)
 
 class SendEmailRequest(BaseModel):
     module_name: str
     git_tag: str
     release_note_link: str
 
-def fetch_jira_ticket_content(jira_base_url: str, jira_email: str, jira_api_token: str, ticket_key: str):
+def report_missing_settings():
+    """Log once at startup which credentials are missing, instead of only on the first request"""
+    missing_vars = settings.missing("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN", "GITHUB_TOKEN", "GITHUB_OWNER", "OPENAI_API_KEY")
+    if missing_vars:
+        logger.warning(f"Missing environment variables, dependent endpoints will fail: {', '.join(missing_vars)}")
+
+def require_settings(*names: str, description: str = "environment variables"):
+    """Raise an HTTPException listing the required environment variables that are not set"""
+    missing_vars = settings.missing(*names)
+    if missing_vars:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Missing {description}: {', '.join(missing_vars)}"
+        )
+
+def request_deadline(seconds: Optional[float] = None):
+    """Start the deadline of a request: its own deadline_seconds, else REQUEST_DEADLINE_SECONDS"""
+    return Deadline(seconds if seconds is not None else settings.request_deadline_seconds)
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    logger.error(f"Request deadline exceeded for {request.url.path}")
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded before upstream calls finished."})
+
+def upstream_get(url: str, deadline: Optional[Deadline] = None, budget: Optional[RequestBudget] = None, **kwargs):
+    """
+    GET a JIRA/GitHub API URL with a timeout bounded by the request deadline
+
+    Background prewarming passes the request budget of its cycle.
+
+    Raises:
+        DeadlineExceeded: If the deadline expires before or during the request
+        BudgetExhausted: If the budget is used up
+    """
+    timeout = deadline.timeout(settings.upstream_timeout_seconds) if deadline else settings.upstream_timeout_seconds
+    if budget:
+        budget.spend()
+    try:
+        response = requests.get(url, timeout=timeout, **kwargs)
+    except requests.exceptions.Timeout:
+        if deadline and deadline.expired():
+            raise DeadlineExceeded("Request deadline exceeded")
+        raise
+    if budget:
+        budget.observe(response)
+    return response
+
+def jira_auth_headers(jira_email: str, jira_api_token: str):
+    """Build the JIRA API request headers (basic auth with email:api_token)"""
+    auth_string = f"{jira_email}:{jira_api_token}"
+    auth_bytes = auth_string.encode('ascii')
+    auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
+    
+    return {
+        "Authorization": f"Basic {auth_b64}",
+        "Accept": "application/json",
+        "Content-Type": "application/json"
+    }
+
+def normalize_jira_issue(ticket_data: dict):
+    """
+    Extract the fields used in prompts from a JIRA issue, converting the ADF description to text
+
+    Used for single-issue fetches and JQL search results alike, so both cache the same shape.
+    """
+    # JIRA returns null for unset fields (e.g. no priority or a deleted reporter)
+    fields = ticket_data.get('fields') or {}
+    
+    # Convert ADF description to human-readable text
+    description_adf = (fields.get('description') or {}).get('content', [])
+    description_text = convert_adf_to_text(description_adf)
+    
+    return {
+        "key": ticket_data.get('key'),
+        "summary": fields.get('summary'),
+        "description": description_text,
+        "status": (fields.get('status') or {}).get('name'),
+        "priority": (fields.get('priority') or {}).get('name'),
+        "assignee": (fields.get('assignee') or {}).get('displayName'),
+        "reporter": (fields.get('reporter') or {}).get('displayName'),
+        "created": fields.get('created'),
+        "updated": fields.get('updated'),
+        "issue_type": (fields.get('issuetype') or {}).get('name')
+    }
+
+def fetch_jira_ticket_content(jira_base_url: str, jira_email: str, jira_api_token: str, ticket_key: str,
+                              deadline: Optional[Deadline] = None):
     """
     Fetch JIRA ticket content using JIRA REST API
     
@@ -123,55 +314,27 @@ def fetch_jira_ticket_content(jira_base_url: str, jira_email: str, jira_api_toke
         jira_email: Email address of JIRA user
         jira_api_token: JIRA API token for authentication
         ticket_key: JIRA ticket key (e.g., "PROJ-123")
+        deadline: Request deadline bounding the API call
     
     Returns:
         dict: JIRA ticket data including summary, description, status, etc.
     """
     logger.info(f"Fetching JIRA ticket content for: {ticket_key}")
     
-    # Create basic auth string (email:api_token encoded in base64)
-    auth_string = f"{jira_email}:{jira_api_token}"
-    auth_bytes = auth_string.encode('ascii')
-    auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
-    
-    headers = {
-        "Authorization": f"Basic {auth_b64}",
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
+    headers = jira_auth_headers(jira_email, jira_api_token)
     
     # JIRA REST API endpoint to get issue details
     jira_api_url = f"{jira_base_url.rstrip('/')}/rest/api/3/issue/{ticket_key}"
     
     try:
         logger.info(f"Making request to JIRA API: {jira_api_url}")
-        response = requests.get(jira_api_url, headers=headers)
+        response = upstream_get(jira_api_url, deadline, headers=headers)
         
         if response.status_code == 200:
             ticket_data = response.json()
             logger.info(f"Successfully fetched JIRA ticket: {ticket_key}")
             
-            # Extract relevant information
-            fields = ticket_data.get('fields', {})
-            
-            # Convert ADF description to human-readable text
-            description_adf = fields.get('description', {}).get('content', []) if fields.get('description') else []
-            description_text = convert_adf_to_text(description_adf)
-            
-            result = {
-                "key": ticket_data.get('key'),
-                "summary": fields.get('summary'),
-                "description": description_text,
-                "status": fields.get('status', {}).get('name'),
-                "priority": fields.get('priority', {}).get('name'),
-                "assignee": fields.get('assignee', {}).get('displayName') if fields.get('assignee') else None,
-                "reporter": fields.get('reporter', {}).get('displayName'),
-                "created": fields.get('created'),
-                "updated": fields.get('updated'),
-                "issue_type": fields.get('issuetype', {}).get('name')
-            }
-            
-            return result
+            return normalize_jira_issue(ticket_data)
             
         elif response.status_code == 401:
             logger.error("JIRA authentication failed - check email and API token")
@@ -290,23 +453,136 @@ def format_commit_diffs_for_prompt(commit_diffs):
     
     return "\n".join(formatted_diffs)
 
-def call_openai_with_prompt(prompt_text):
+def format_repo_changes_for_prompt(repo_changes):
+    """
+    Format the commit diffs of one or more repositories for inclusion in the prompt
+    """
+    if len(repo_changes) == 1:
+        return format_commit_diffs_for_prompt(repo_changes[0]["commit_diffs"])
+    
+    sections = []
+    for changes in repo_changes:
+        section = f"=== REPOSITORY {settings.github_owner}/{changes['repo']} ===\n"
+        section += format_commit_diffs_for_prompt(changes["commit_diffs"])
+        sections.append(section)
+    
+    return "\n\n".join(sections)
+
+def get_openai_client():
+    """Return the OpenAI client, importing the SDK and creating the client on first use"""
+    global client
+    if client is None:
+        with openai_clients_lock:
+            if client is None:
+                from openai import OpenAI
+                # Retries are left to hedging/failover, within the request deadline
+                client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url, max_retries=0)
+    return client
+
+def get_fallback_openai_client():
+    """Return the client of the fallback provider/model, or None if no fallback is configured"""
+    global fallback_client
+    if fallback_client is None and (settings.openai_fallback_model or settings.openai_fallback_base_url):
+        with openai_clients_lock:
+            if fallback_client is None:
+                from openai import OpenAI
+                fallback_client = OpenAI(
+                    api_key=settings.openai_fallback_api_key or settings.openai_api_key,
+                    base_url=settings.openai_fallback_base_url or settings.openai_base_url,
+                    max_retries=0
+                )
+    return fallback_client
+
+def openai_completion(provider_client, model: str, messages, max_tokens: int, deadline: Deadline, record_latency: bool,
+                      settled: threading.Event):
+    """
+    Build one chat completion attempt, with a timeout bounded by the request deadline
+
+    Each attempt holds a slot of openai_semaphore while its request is in flight, so the
+    global cap also counts a hedge that lost and is still running. Attempts that only get
+    a slot after another one has answered (`settled`) are skipped.
+    """
+    def attempt():
+        # Waiting for a slot counts against the deadline too
+        if not openai_semaphore.acquire(timeout=deadline.remaining()):
+            raise DeadlineExceeded("Request deadline exceeded waiting for an OpenAI slot")
+        try:
+            if settled.is_set():
+                raise RuntimeError(f"{model} attempt skipped, another attempt already answered")
+            started = time.monotonic()
+            try:
+                response = provider_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.3,
+                    timeout=deadline.timeout(settings.openai_timeout_seconds)
+                )
+            except Exception:
+                if deadline.expired():
+                    raise DeadlineExceeded("Request deadline exceeded")
+                raise
+        finally:
+            openai_semaphore.release()
+        if record_latency:
+            openai_latency.record(time.monotonic() - started)
+        logger.info(f"{model} answered in {time.monotonic() - started:.1f}s")
+        return response.choices[0].message.content
+    return attempt
+
+def complete_with_hedging(system_prompt: str, prompt_text: str, max_tokens: int, deadline: Deadline):
+    """
+    Run the chat completion on the primary model, racing a backup against it when it is slow or fails
+
+    The backup is the fallback model/provider if one is configured, else (with hedging
+    enabled) a duplicate request to the primary. It starts as soon as the primary fails,
+    or, with hedging enabled, once the primary has taken longer than the recent
+    OPENAI_HEDGE_PERCENTILE latency; whichever answers first wins.
+    """
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt_text}
+    ]
+    primary_client = get_openai_client()
+    backup_client = get_fallback_openai_client()
+    settled = threading.Event()
+    attempts = [openai_completion(primary_client, settings.openai_model, messages, max_tokens, deadline, True, settled)]
+    if backup_client is not None:
+        attempts.append(openai_completion(
+            backup_client, settings.openai_fallback_model or settings.openai_model, messages, max_tokens, deadline, False, settled
+        ))
+    elif settings.openai_hedge_enabled:
+        attempts.append(openai_completion(primary_client, settings.openai_model, messages, max_tokens, deadline, True, settled))
+    
+    hedge_delay = None
+    if settings.openai_hedge_enabled:
+        hedge_delay = openai_latency.hedge_delay(settings.openai_hedge_percentile, settings.openai_hedge_default_delay, settings.openai_hedge_min_delay)
+    try:
+        return hedged_call(attempts, hedge_delay, deadline)
+    finally:
+        settled.set()
+
+def call_openai_with_prompt(prompt_text, deadline: Optional[Deadline] = None):
     """
     Send the populated prompt to OpenAI and return the response
+
+    The call is bounded by the request deadline and hedged/failed over to the fallback
+    model when configured (see complete_with_hedging).
     """
+    deadline = deadline or Deadline()
     try:
         logger.info("Sending prompt to OpenAI...")
-        
+    
         # Estimate token count (rough approximation: 1 token ≈ 4 characters)
         estimated_tokens = len(prompt_text) // 4
         max_tokens_for_prompt = 6000  # Leave room for response
-        
+    
         # If prompt is too long, truncate it intelligently
         if estimated_tokens > max_tokens_for_prompt:
             logger.warning(f"Prompt estimated at {estimated_tokens} tokens, truncating to fit context window")
             # Truncate to approximately 6000 tokens worth of characters
             max_chars = max_tokens_for_prompt * 4
-            
+        
             # Try to truncate at a natural boundary (end of a commit or section)
             truncation_point = max_chars
             for boundary in ["\n\nCommit ", "\nCommit ", "\n\n", "\n"]:
@@ -314,29 +590,22 @@ def call_openai_with_prompt(prompt_text):
                 if last_boundary > max_chars * 0.8:  # Don't truncate too aggressively
                     truncation_point = last_boundary
                     break
-            
+        
             prompt_text = prompt_text[:truncation_point] + "\n\n[Note: Content truncated due to length limits]"
             logger.info(f"Truncated prompt to approximately {len(prompt_text) // 4} tokens")
-        
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-preview",  # Has 128k context window vs 8k for gpt-4
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a senior technical release note writer. Be concise but comprehensive in your analysis."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt_text
-                }
-            ],
+    
+        release_note = complete_with_hedging(
+            "You are a senior technical release note writer. Be concise but comprehensive in your analysis.",
+            prompt_text,
             max_tokens=2000,
-            temperature=0.3
+            deadline=deadline
         )
-        
+    
         logger.info("Successfully received response from OpenAI")
-        return response.choices[0].message.content
-        
+        return release_note
+    
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error calling OpenAI API: {str(e)}")
         # If it's still a context length error, try with even more aggressive truncation
@@ -347,27 +616,20 @@ def call_openai_with_prompt(prompt_text):
             if len(prompt_text) > max_chars:
                 prompt_text = prompt_text[:max_chars] + "\n\n[Note: Content heavily truncated due to length limits]"
                 try:
-                    response = client.chat.completions.create(
-                        model="gpt-4-turbo-preview",
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a senior technical release note writer. Be concise but comprehensive."
-                            },
-                            {
-                                "role": "user", 
-                                "content": prompt_text
-                            }
-                        ],
+                    release_note = complete_with_hedging(
+                        "You are a senior technical release note writer. Be concise but comprehensive.",
+                        prompt_text,
                         max_tokens=1500,
-                        temperature=0.3
+                        deadline=deadline
                     )
                     logger.info("Successfully received response from OpenAI after aggressive truncation")
-                    return response.choices[0].message.content
+                    return release_note
+                except DeadlineExceeded:
+                    raise
                 except Exception as retry_e:
                     logger.error(f"Even aggressive truncation failed: {str(retry_e)}")
                     raise HTTPException(status_code=500, detail=f"Failed to generate release note even with truncation: {str(retry_e)}")
-        
+    
         raise HTTPException(status_code=500, detail=f"Failed to generate release note with OpenAI: {str(e)}")
 
 def send_release_email(module_name: str, git_tag: str, release_note_link: str):
@@ -384,23 +646,15 @@ def send_release_email(module_name: str, git_tag: str, release_note_link: str):
     """
     logger.info(f"Sending release email for {module_name} tag: {git_tag}")
     
-    # Check required environment variables
-    if not all([JIRA_EMAIL, EMAIL_PASSWORD]):
-        missing_vars = []
-        if not JIRA_EMAIL:
-            missing_vars.append("JIRA_EMAIL")
-        if not EMAIL_PASSWORD:
-            missing_vars.append("EMAIL_PASSWORD")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Missing email environment variables: {', '.join(missing_vars)}"
-        )
+    require_settings("JIRA_EMAIL", "EMAIL_PASSWORD", description="email environment variables")
     
-    # Type assertions since we validated they're not None above
-    assert JIRA_EMAIL and EMAIL_PASSWORD
+    # Imported here: only this endpoint sends email
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
     
     # Email configuration
-    sender_email = JIRA_EMAIL
+    sender_email = settings.jira_email
     to_email = "qa@applova.io"
     cc_email = "devs@applova.io"
     
@@ -426,9 +680,9 @@ Thanks and regards"""
         msg.attach(MIMEText(body, 'plain'))
         
         # Gmail SMTP configuration
-        server = smtplib.SMTP(EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT)
+        server = smtplib.SMTP(settings.email_smtp_server, settings.email_smtp_port)
         server.starttls()  # Enable encryption
-        server.login(sender_email, EMAIL_PASSWORD)
+        server.login(sender_email, settings.email_password)
         
         # Send email
         recipients = [to_email, cc_email]
@@ -453,36 +707,24 @@ Thanks and regards"""
         logger.error(f"Unexpected error sending email: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Unexpected error sending email: {str(e)}")
 
-@app.get("/repositories")
-def get_repositories():
-    """Get list of repositories for the configured GitHub owner"""
-    if not all([GITHUB_TOKEN, GITHUB_OWNER]):
-        missing_vars = []
-        if not GITHUB_TOKEN:
-            missing_vars.append("GITHUB_TOKEN")
-        if not GITHUB_OWNER:
-            missing_vars.append("GITHUB_OWNER")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Missing environment variables: {', '.join(missing_vars)}"
-        )
-    
+def fetch_repository_list(budget: Optional[RequestBudget] = None):
+    """Fetch the repositories of the configured GitHub owner with pagination"""
     headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
+        "Authorization": f"token {settings.github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
     
     try:
         # Fetch repositories for the user/organization
-        repos_url = f"https://api.github.com/users/{GITHUB_OWNER}/repos"
-        logger.info(f"Fetching repositories for {GITHUB_OWNER}")
+        repos_url = f"{settings.github_api_url}/users/{settings.github_owner}/repos"
+        logger.info(f"Fetching repositories for {settings.github_owner}")
         
         all_repos = []
         page = 1
         
         # Handle pagination
         while True:
-            response = requests.get(repos_url, headers=headers, params={
+            response = upstream_get(repos_url, budget=budget, headers=headers, params={
                 "per_page": 100,
                 "page": page,
                 "sort": "updated",
@@ -524,334 +766,918 @@ def get_repositories():
             repo_list.append(repo_info)
         
         logger.info(f"Successfully fetched {len(repo_list)} repositories")
-        return {
-            "repositories": repo_list,
-            "total_count": len(repo_list),
-            "owner": GITHUB_OWNER
-        }
+        return repo_list
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Network error while fetching repositories: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Network error connecting to GitHub: {str(e)}")
 
+@app.get("/repositories")
+def get_repositories():
+    """Get list of repositories for the configured GitHub owner"""
+    require_settings("GITHUB_TOKEN", "GITHUB_OWNER")
+    
+    repo_list = cache.get_or_set(f"github:repos:{settings.github_owner}", fetch_repository_list, settings.cache_ttl_repositories)
+    return {
+        "repositories": repo_list,
+        "total_count": len(repo_list),
+        "owner": settings.github_owner
+    }
+
 @app.get("/test-jira/{ticket_key}")
 def test_jira_connection(ticket_key: str):
     """Test endpoint to verify JIRA connection using environment variables"""
-    # Using environment variables
-    if not all([JIRA_BASE_URL, JIRA_EMAIL, JIRA_TOKEN]):
-        missing_vars = []
-        if not JIRA_BASE_URL:
-            missing_vars.append("JIRA_BASE_URL")
-        if not JIRA_EMAIL:
-            missing_vars.append("JIRA_EMAIL")
-        if not JIRA_TOKEN:
-            missing_vars.append("JIRA_TOKEN")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Missing environment variables: {', '.join(missing_vars)}"
-        )
-    
-    # Type assertions since we validated they're not None above
-    assert JIRA_BASE_URL and JIRA_EMAIL and JIRA_TOKEN
-    return fetch_jira_ticket_content(JIRA_BASE_URL, JIRA_EMAIL, JIRA_TOKEN, ticket_key)
+    require_settings("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN")
+    return fetch_jira_ticket_content(settings.jira_base_url, settings.jira_email, settings.jira_token, ticket_key)
 
-@app.post("/generate-release-note/")
-def generate_release_note(data: GenerateReleaseNoteRequest):
-    logger.info(f"Received request to generate release note for repo '{GITHUB_OWNER}/{data.repo}' and tickets '{', '.join(data.jira_tickets)}'")
-    
-    # Check if required environment variables are set
-    if not all([JIRA_BASE_URL, JIRA_EMAIL, JIRA_TOKEN, GITHUB_TOKEN, GITHUB_OWNER, OPENAI_API_KEY]):
-        missing_vars = []
-        if not JIRA_BASE_URL:
-            missing_vars.append("JIRA_BASE_URL")
-        if not JIRA_EMAIL:
-            missing_vars.append("JIRA_EMAIL")
-        if not JIRA_TOKEN:
-            missing_vars.append("JIRA_TOKEN")
-        if not GITHUB_TOKEN:
-            missing_vars.append("GITHUB_TOKEN")
-        if not GITHUB_OWNER:
-            missing_vars.append("GITHUB_OWNER")
-        if not OPENAI_API_KEY:
-            missing_vars.append("OPENAI_API_KEY")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Missing environment variables: {', '.join(missing_vars)}"
-        )
-    
-    # Type assertions since we validated they're not None above
-    assert JIRA_BASE_URL and JIRA_EMAIL and JIRA_TOKEN and GITHUB_TOKEN and GITHUB_OWNER and OPENAI_API_KEY
-    
-    # Fetch all JIRA tickets content
-    jira_tickets_content = []
-    failed_tickets = []
-    
-    for ticket_key in data.jira_tickets:
+def fetch_jira_tickets(ticket_keys: List[str], deadline: Optional[Deadline] = None):
+    """
+    Fetch the content of several JIRA tickets concurrently, each ticket only once
+
+    Args:
+        ticket_keys: JIRA ticket keys (duplicates are fetched once)
+        deadline: Request deadline bounding the API calls
+
+    Returns:
+        tuple: (list of ticket data in request order, list of ticket keys that failed)
+    """
+    unique_keys = list(dict.fromkeys(ticket_keys))
+
+    def fetch_one(ticket_key):
         try:
-            jira_content = fetch_jira_ticket_content(
-                JIRA_BASE_URL,
-                JIRA_EMAIL,
-                JIRA_TOKEN,
-                ticket_key
+            jira_content = cache.get_or_set(
+                f"jira:ticket:{ticket_key}",
+                lambda: fetch_jira_ticket_content(settings.jira_base_url, settings.jira_email, settings.jira_token, ticket_key, deadline),
+                settings.cache_ttl_jira_ticket,
+                deadline
             )
-            jira_tickets_content.append(jira_content)
             logger.info(f"Successfully fetched JIRA ticket content: {ticket_key} - {jira_content['summary']}")
+            return jira_content
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch JIRA ticket {ticket_key}: {str(e)}")
-            failed_tickets.append(ticket_key)
-    
-    if not jira_tickets_content:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch any JIRA tickets. Failed tickets: {', '.join(failed_tickets)}")
-    
-    if failed_tickets:
-        logger.warning(f"Some tickets failed to fetch: {', '.join(failed_tickets)}")
-    
-    # Continue with GitHub commit fetching
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
+            return None
+
+    if not unique_keys:
+        return [], []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(unique_keys), settings.max_jira_workers))) as executor:
+        results = list(executor.map(fetch_one, unique_keys))
+
+    jira_tickets_content = [content for content in results if content is not None]
+    failed_tickets = [key for key, content in zip(unique_keys, results) if content is None]
+    return jira_tickets_content, failed_tickets
+
+def github_headers():
+    """Build the GitHub API request headers"""
+    return {
+        "Authorization": f"token {settings.github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
-    commits_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{data.repo}/commits"
-    all_commits = []
+
+class CommitRecord:
+    """
+    Compact commit record holding only the fields the pipeline uses
+
+    GitHub commit JSON carries author/committer objects, URLs and verification blocks;
+    only the SHA, message and commit date are kept.
+    """
+    __slots__ = ("sha", "message", "committed_at")
+
+    def __init__(self, sha: str, message: str, committed_at: Optional[str] = None):
+        self.sha = sha
+        self.message = message
+        self.committed_at = committed_at
+
+def to_github_timestamp(value: Optional[datetime]):
+    """Format a datetime as the UTC ISO 8601 timestamp used by the GitHub API"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def fetch_matching_commits(repo: str, ticket_keys: List[str], headers: dict, since: Optional[str] = None,
+                           until: Optional[str] = None, stop_when_matched: bool = False,
+                           deadline: Optional[Deadline] = None, budget: Optional[RequestBudget] = None):
+    """
+    Paginate the commits of a repository (up to 1000) and keep the ones matching the tickets
+
+    Each page is projected into compact CommitRecords as soon as it is parsed, and only
+    commits whose message starts with one of the `[TICKET-KEY]` prefixes are kept.
+
+    Args:
+        repo: Repository name
+        ticket_keys: JIRA ticket keys to match
+        headers: GitHub API request headers
+        since: Only list commits after this UTC timestamp (passed to GitHub, bounds pagination)
+        until: Only list commits before this UTC timestamp
+        stop_when_matched: Stop after the first page on which every ticket has a matching commit
+        deadline: Request deadline bounding the API calls
+        budget: Request budget of a background prewarm cycle
+
+    Returns:
+        tuple: (matching commit records newest first, dict of ticket key -> matching commit count)
+    """
+    commits_url = f"{settings.github_api_url}/repos/{settings.github_owner}/{repo}/commits"
+    params = {"per_page": 100}
+    if since:
+        params["since"] = since
+    if until:
+        params["until"] = until
+    
+    ticket_commit_count = {ticket_key: 0 for ticket_key in ticket_keys}
+    matching_commits = []
+    total_commits = 0
     page = 1
 
-    # Fetch all commits with pagination (up to 1000 commits)
-    logger.info("Fetching commits from GitHub...")
+    logger.info(f"Fetching commits from GitHub for {repo}...")
     while True:
-        resp = requests.get(commits_url, headers=headers, params={"per_page": 100, "page": page})
-        logger.info(f"Requested page {page} of commits. Status: {resp.status_code}")
+        try:
+            resp = upstream_get(commits_url, deadline, budget, headers=headers, params={**params, "page": page})
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Network error while fetching commits for {repo}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Network error connecting to GitHub: {str(e)}")
+        logger.info(f"[{repo}] Requested page {page} of commits. Status: {resp.status_code}")
         if resp.status_code != 200:
-            logger.error(f"Failed to fetch commits from GitHub: {resp.text}")
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch commits from GitHub.")
+            logger.error(f"Failed to fetch commits from GitHub for {repo}: {resp.text}")
+            raise HTTPException(status_code=resp.status_code, detail=f"Failed to fetch commits from GitHub for '{repo}'.")
         batch = resp.json()
         if not batch:
-            logger.info("No more commits found, ending pagination.")
+            logger.info(f"[{repo}] No more commits found, ending pagination.")
             break
-        all_commits.extend(batch)
+        total_commits += len(batch)
+        for c in batch:
+            commit = c['commit']
+            ticket_key = parse_ticket_key(commit['message'])
+            if ticket_key in ticket_commit_count:
+                ticket_commit_count[ticket_key] += 1
+                matching_commits.append(CommitRecord(c['sha'], commit['message'], (commit.get('committer') or {}).get('date')))
         if len(batch) < 100:
-            logger.info("Last page of commits reached.")
+            logger.info(f"[{repo}] Last page of commits reached.")
+            break
+        if stop_when_matched and all(ticket_commit_count.values()):
+            logger.info(f"[{repo}] Every ticket has a matching commit, stopping pagination early.")
             break
         page += 1
         if page > 10:
-            logger.warning("Hard limit of 1000 commits reached, stopping pagination to prevent abuse.")
+            logger.warning(f"[{repo}] Hard limit of 1000 commits reached, stopping pagination to prevent abuse.")
             break
 
-    logger.info(f"Total commits fetched: {len(all_commits)}")
+    logger.info(f"[{repo}] Total commits fetched: {total_commits}")
+    for ticket_key, count in ticket_commit_count.items():
+        logger.info(f"Found {count} commits matching pattern '[{ticket_key}]'.")
+    return matching_commits, ticket_commit_count
+
+def lookup_indexed_commits(repo: str, ticket_keys: List[str], since: Optional[str] = None, until: Optional[str] = None):
+    """
+    Find the commits of each ticket in the commit index of a synced repository
 
-    # Create patterns for all tickets and find matching commits
-    all_matching_commits = []
+    Returns:
+        tuple: (matching commit records newest first, dict of ticket key -> matching commit count)
+    """
+    indexed = commit_index.lookup(repo, ticket_keys, since=since, until=until)
     ticket_commit_count = {}
-    
-    for ticket_key in data.jira_tickets:
-        pattern = rf"^\[{re.escape(ticket_key)}\]"
-        matching_commits = [
-            c for c in all_commits if re.match(pattern, c['commit']['message'])
-        ]
-        ticket_commit_count[ticket_key] = len(matching_commits)
-        all_matching_commits.extend(matching_commits)
-        logger.info(f"Found {len(matching_commits)} commits matching pattern '[{ticket_key}]'.")
-    
-    # Remove duplicates (in case a commit mentions multiple tickets)
-    unique_commits = {c['sha']: c for c in all_matching_commits}.values()
-    unique_commits = list(unique_commits)
-    
-    logger.info(f"Total unique commits found: {len(unique_commits)}")
+    matching_commits = []
+    for ticket_key in dict.fromkeys(ticket_keys):
+        matches = indexed.get(ticket_key, [])
+        ticket_commit_count[ticket_key] = len(matches)
+        matching_commits.extend(CommitRecord(sha, message, committed_at) for sha, message, committed_at in matches)
+        logger.info(f"Found {len(matches)} indexed commits for '[{ticket_key}]'.")
+    return matching_commits, ticket_commit_count
+
+def fetch_commit_files(repo: str, sha: str, headers: dict, deadline: Optional[Deadline] = None,
+                       budget: Optional[RequestBudget] = None):
+    """
+    Fetch the changed files (filename and patch) of one commit
+
+    Returns:
+        list: File diffs, or None if GitHub returned an error
+    """
+    commit_url = f"{settings.github_api_url}/repos/{settings.github_owner}/{repo}/commits/{sha}"
+    logger.info(f"Fetching diff for commit {sha}...")
+    try:
+        commit_resp = upstream_get(commit_url, deadline, budget, headers=headers)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Network error while fetching diff for commit {sha}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Network error connecting to GitHub: {str(e)}")
+    if commit_resp.status_code != 200:
+        logger.warning(f"Failed to fetch diff for commit {sha}: {commit_resp.text}")
+        return None
+    commit_data = commit_resp.json()
+    return [
+        {
+            "filename": f.get("filename", ""),
+            "patch": f.get("patch", ""),
+        }
+        for f in commit_data.get("files", [])
+    ]
 
+def fetch_commit_diffs(repo: str, commits, headers: dict, deadline: Optional[Deadline] = None,
+                       budget: Optional[RequestBudget] = None):
+    """
+    Fetch the file diffs of each commit in a repository
+    """
     commit_diffs = []
-    for c in unique_commits:
-        sha = c['sha']
-        commit_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{data.repo}/commits/{sha}"
-        logger.info(f"Fetching diff for commit {sha}...")
-        commit_resp = requests.get(commit_url, headers=headers)
-        if commit_resp.status_code != 200:
-            logger.warning(f"Failed to fetch diff for commit {sha}: {commit_resp.text}")
+    for c in commits:
+        sha = c.sha
+        files = cache.get_or_set(
+            f"github:diff:{settings.github_owner}/{repo}:{sha}",
+            lambda: fetch_commit_files(repo, sha, headers, deadline, budget),
+            settings.cache_ttl_commit_diff,
+            deadline
+        )
+        if files is None:
             continue
-        commit_data = commit_resp.json()
-        files = [
-            {
-                "filename": f.get("filename", ""),
-                "patch": f.get("patch", ""),
-            }
-            for f in commit_data.get("files", [])
-        ]
         logger.info(f"Commit {sha}: {len(files)} files with diffs.")
         commit_diffs.append({
             "sha": sha,
-            "message": c['commit']['message'],
-            "files": files
+            "message": c.message,
+            "committed_at": c.committed_at,
+            "files": files,
+            "repo": repo
         })
+    return commit_diffs
+
+def collect_repo_changes(repo: str, ticket_keys: List[str], headers: dict, since: Optional[str] = None,
+                         until: Optional[str] = None, stop_when_matched: bool = False,
+                         deadline: Optional[Deadline] = None, budget: Optional[RequestBudget] = None):
+    """
+    Fetch commits of one repository, match them to the tickets and fetch their diffs
+    """
+    if commit_index.is_synced(repo):
+        # Pick up commits pushed since the last sync, then look up the matching commits
+        # directly instead of paginating the history
+        if not commit_index_is_fresh(repo):
+            sync_repo_commit_index(repo, deadline=deadline, budget=budget)
+        matching_commits, ticket_commit_count = lookup_indexed_commits(repo, ticket_keys, since, until)
+        logger.info(f"[{repo}] Matched commits from the commit index")
+    else:
+        matching_commits, ticket_commit_count = fetch_matching_commits(
+            repo, ticket_keys, headers, since, until, stop_when_matched, deadline, budget
+        )
+    logger.info(f"[{repo}] Total unique commits found: {len(matching_commits)}")
+
+    commit_diffs = fetch_commit_diffs(repo, matching_commits, headers, deadline, budget)
+    logger.info(f"[{repo}] Found {len(commit_diffs)} commit diffs to process.")
+    return {
+        "repo": repo,
+        "ticket_commit_counts": ticket_commit_count,
+        "commit_diffs": commit_diffs
+    }
+
+def collect_changes_for_repos(repos: List[str], data: GenerateReleaseNoteRequest, deadline: Optional[Deadline] = None):
+    """
+    Collect matching commits and diffs for several repositories in parallel
 
-    logger.info(f"Found {len(commit_diffs)} commit diffs to process.")
+    Returns:
+        list: One result per repository (see collect_repo_changes), in request order
+    """
+    headers = github_headers()
+    since = to_github_timestamp(data.since)
+    until = to_github_timestamp(data.until)
+    
+    def collect(repo):
+        return collect_repo_changes(repo, data.jira_tickets, headers, since, until, data.stop_when_matched, deadline)
     
-    # Read the prompt template
+    with ThreadPoolExecutor(max_workers=max(1, min(len(repos), settings.max_repo_workers))) as executor:
+        return list(executor.map(collect, repos))
+
+def merge_ticket_commit_counts(repo_changes):
+    """Sum the per-ticket commit counts across repositories"""
+    merged = {}
+    for changes in repo_changes:
+        for ticket_key, count in changes["ticket_commit_counts"].items():
+            merged[ticket_key] = merged.get(ticket_key, 0) + count
+    return merged
+
+def validate_release_note_request(data: GenerateReleaseNoteRequest):
+    """Return the requested repositories, rejecting requests without any or with an unknown template"""
+    repos = data.repo_list()
+    if not repos:
+        raise HTTPException(status_code=400, detail="At least one repository must be provided in 'repo' or 'repos'.")
+    validate_template(data.template)
+    return repos
+
+def validate_template(template: Optional[str]):
+    """Reject an explicitly requested template that has no override file, instead of silently using prompt.txt"""
+    if template and not prompt_templates.has_override(template):
+        raise HTTPException(status_code=400, detail=f"Unknown prompt template '{template}'.")
+
+def read_prompt_template(name: Optional[str] = None):
+    """
+    Get the prompt template for a repository or module from the template registry
+    """
     try:
-        with open("prompt.txt", "r", encoding="utf-8") as f:
-            prompt_template = f.read()
-        logger.info("Successfully read prompt template")
+        return prompt_templates.get(name)
     except FileNotFoundError:
         logger.error("prompt.txt file not found")
         raise HTTPException(status_code=500, detail="prompt.txt template file not found")
     except Exception as e:
         logger.error(f"Error reading prompt template: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error reading prompt template: {str(e)}")
+
+def prompt_template_name(data: ReleaseNoteScope, repos: List[str]):
+    """The template override to use: the requested template, else the repository of a single-repo request"""
+    if data.template:
+        return data.template
+    return repos[0] if len(repos) == 1 else None
+
+def build_release_note_prompt(jira_tickets_content, repo_changes, template_name: Optional[str] = None):
+    """
+    Populate the prompt template with JIRA ticket content and the commit diffs of all repositories
+    """
+    prompt_template = read_prompt_template(template_name)
     
-    # Format the data for the prompt
-    formatted_jira_tickets = format_multiple_jira_tickets_for_prompt(jira_tickets_content)
-    formatted_commit_diffs = format_commit_diffs_for_prompt(commit_diffs)
-    
-    # Replace placeholders in the prompt template
-    populated_prompt = prompt_template.replace(
-        "<PASTE_JIRA_TICKET_CONTENT_HERE>", 
-        formatted_jira_tickets
-    ).replace(
-        "<PASTE_GIT_DIFFS_HERE>", 
-        formatted_commit_diffs
-    )
-    
-    logger.info("Successfully populated prompt template with JIRA and GitHub data")
-    
-    # Send to OpenAI and get the response
-    release_note = call_openai_with_prompt(populated_prompt)
+    # Format the data for the prompt and fill the placeholders in a single join
+    populated_prompt = prompt_template.render({
+        JIRA_TICKET_PLACEHOLDER: format_multiple_jira_tickets_for_prompt(jira_tickets_content),
+        GIT_DIFFS_PLACEHOLDER: format_repo_changes_for_prompt(repo_changes)
+    })
     
+    logger.info(f"Successfully populated prompt template {prompt_template.path} with JIRA and GitHub data")
+    return populated_prompt
+
+def build_release_note_response(release_note, jira_ticket_keys, jira_tickets_content, failed_tickets, repos, repo_changes):
+    """Build the response body of a generated release note"""
     return {
         "success": True,
         "release_note": release_note,
-        "jira_tickets": data.jira_tickets,
+        "jira_tickets": jira_ticket_keys,
         "successful_tickets": [ticket['key'] for ticket in jira_tickets_content],
         "failed_tickets": failed_tickets,
-        "ticket_commit_counts": ticket_commit_count,
-        "repository": f"{GITHUB_OWNER}/{data.repo}",
-        "commits_processed": len(commit_diffs)
+        "ticket_commit_counts": merge_ticket_commit_counts(repo_changes),
+        "repository": ", ".join(f"{settings.github_owner}/{repo}" for repo in repos),
+        "repositories": [f"{settings.github_owner}/{repo}" for repo in repos],
+        "repo_commit_counts": {changes["repo"]: len(changes["commit_diffs"]) for changes in repo_changes},
+        "commits_processed": sum(len(changes["commit_diffs"]) for changes in repo_changes)
     }
 
+def project_fields(payload: dict, fields: Optional[List[str]], always=()):
+    """Keep only the requested top-level fields of a response (all fields when none are requested)"""
+    if not fields:
+        return payload
+    wanted = set(fields).union(always)
+    return {key: value for key, value in payload.items() if key in wanted}
+
+def project_commit_diffs(commit_diffs, include_patches: bool = True, max_patch_lines: Optional[int] = None):
+    """
+    Drop or truncate the patches of commit diffs for the debug response
+
+    Returns new dicts; the (possibly cached) input diffs are left untouched.
+    """
+    if include_patches and max_patch_lines is None:
+        return commit_diffs
+    
+    projected = []
+    for diff in commit_diffs:
+        files = []
+        for file_info in diff["files"]:
+            if not include_patches:
+                files.append({"filename": file_info["filename"]})
+                continue
+            patch_lines = file_info["patch"].split("\n")
+            files.append({
+                "filename": file_info["filename"],
+                "patch": "\n".join(patch_lines[:max_patch_lines]),
+                "patch_truncated": len(patch_lines) > max_patch_lines
+            })
+        projected.append({**diff, "files": files})
+    return projected
+
+def gzip_ndjson_stream(results):
+    """Gzip an NDJSON stream, flushing after every line so each result is sent as soon as it is ready"""
+    compressor = zlib.compressobj(settings.response_gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+    for result in results:
+        yield compressor.compress(dumps_json(result) + b"\n") + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+@app.post("/generate-release-note/")
+def generate_release_note(data: GenerateReleaseNoteRequest):
+    repos = validate_release_note_request(data)
+    logger.info(f"Received request to generate release note for repos '{', '.join(f'{settings.github_owner}/{r}' for r in repos)}' and tickets '{', '.join(data.jira_tickets)}'")
+    
+    require_settings("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN", "GITHUB_TOKEN", "GITHUB_OWNER", "OPENAI_API_KEY")
+    
+    # Every upstream call below is bounded by the time the request has left
+    deadline = request_deadline(data.deadline_seconds)
+    
+    # Fetch all JIRA tickets content (once, shared by all repositories)
+    jira_tickets_content, failed_tickets = fetch_jira_tickets(data.jira_tickets, deadline)
+    
+    if not jira_tickets_content:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch any JIRA tickets. Failed tickets: {', '.join(failed_tickets)}")
+    
+    if failed_tickets:
+        logger.warning(f"Some tickets failed to fetch: {', '.join(failed_tickets)}")
+    
+    # Fetch commits and diffs of every repository in parallel
+    repo_changes = collect_changes_for_repos(repos, data, deadline)
+    
+    populated_prompt = build_release_note_prompt(jira_tickets_content, repo_changes, prompt_template_name(data, repos))
+    
+    # Send to OpenAI and get the response (one call for all repositories)
+    release_note = call_openai_with_prompt(populated_prompt, deadline)
+    
+    return project_fields(
+        build_release_note_response(release_note, data.jira_tickets, jira_tickets_content, failed_tickets, repos, repo_changes),
+        data.fields
+    )
+
 @app.post("/generate-release-note-debug/")
 def generate_release_note_debug(data: GenerateReleaseNoteRequest):
     """
     Debug endpoint that returns raw JIRA tickets and commit diffs without calling OpenAI
     """
-    logger.info(f"Received debug request for repo '{GITHUB_OWNER}/{data.repo}' and tickets '{', '.join(data.jira_tickets)}'")
-    
-    # Check if required environment variables are set (excluding OpenAI for debug)
-    if not all([JIRA_BASE_URL, JIRA_EMAIL, JIRA_TOKEN, GITHUB_TOKEN, GITHUB_OWNER]):
-        missing_vars = []
-        if not JIRA_BASE_URL:
-            missing_vars.append("JIRA_BASE_URL")
-        if not JIRA_EMAIL:
-            missing_vars.append("JIRA_EMAIL")
-        if not JIRA_TOKEN:
-            missing_vars.append("JIRA_TOKEN")
-        if not GITHUB_TOKEN:
-            missing_vars.append("GITHUB_TOKEN")
-        if not GITHUB_OWNER:
-            missing_vars.append("GITHUB_OWNER")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Missing environment variables: {', '.join(missing_vars)}"
-        )
+    repos = validate_release_note_request(data)
+    logger.info(f"Received debug request for repos '{', '.join(f'{settings.github_owner}/{r}' for r in repos)}' and tickets '{', '.join(data.jira_tickets)}'")
     
-    # Type assertions since we validated they're not None above
-    assert JIRA_BASE_URL and JIRA_EMAIL and JIRA_TOKEN and GITHUB_TOKEN and GITHUB_OWNER
+    require_settings("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN", "GITHUB_TOKEN", "GITHUB_OWNER")
+    
+    deadline = request_deadline(data.deadline_seconds)
     
     # Fetch all JIRA tickets content
-    jira_tickets_content = []
-    failed_tickets = []
+    jira_tickets_content, failed_tickets = fetch_jira_tickets(data.jira_tickets, deadline)
     
-    for ticket_key in data.jira_tickets:
+    if not jira_tickets_content:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch any JIRA tickets. Failed tickets: {', '.join(failed_tickets)}")
+    
+    repo_changes = collect_changes_for_repos(repos, data, deadline)
+    result = [diff for changes in repo_changes for diff in changes["commit_diffs"]]
+
+    logger.info(f"Returning {len(result)} commit diffs to client.")
+    return JSONResponseClass(project_fields({
+        "jira_tickets": jira_tickets_content,
+        "failed_tickets": failed_tickets,
+        "ticket_commit_counts": merge_ticket_commit_counts(repo_changes),
+        "repo_commit_counts": {changes["repo"]: len(changes["commit_diffs"]) for changes in repo_changes},
+        "commit_diffs": project_commit_diffs(result, data.include_patches, data.max_patch_lines)
+    }, data.fields))
+
+def select_repo_changes_for_tickets(changes, ticket_keys: List[str], since: Optional[str] = None, until: Optional[str] = None):
+    """
+    Narrow a repository's collected changes down to the commits of the given tickets and date window
+    """
+    ticket_commit_count = {ticket_key: 0 for ticket_key in ticket_keys}
+    commit_diffs = []
+    for diff in changes["commit_diffs"]:
+        ticket_key = parse_ticket_key(diff["message"])
+        if ticket_key not in ticket_commit_count:
+            continue
+        if (since and (diff["committed_at"] or "") < since) or (until and (diff["committed_at"] or "") > until):
+            continue
+        ticket_commit_count[ticket_key] += 1
+        commit_diffs.append(diff)
+    
+    return {
+        "repo": changes["repo"],
+        "ticket_commit_counts": ticket_commit_count,
+        "commit_diffs": commit_diffs
+    }
+
+def plan_release_note_batch(jobs: List[BatchReleaseNoteJob], deadline: Optional[Deadline] = None):
+    """
+    Fetch the upstream data shared by a batch of jobs, deduplicated across jobs
+
+    Every JIRA ticket is fetched once, every repository is paginated once (over the widest
+    date window of the jobs using it) and every matching commit diff is fetched once, no
+    matter how many jobs reference them.
+
+    Returns:
+        dict: Shared JIRA ticket content, failed tickets and per-repository changes (or errors)
+    """
+    all_tickets = list(dict.fromkeys(key for job in jobs for key in job.jira_tickets))
+    repo_tickets = {}
+    repo_jobs = {}
+    for job in jobs:
+        for repo in job.repo_list():
+            repo_tickets.setdefault(repo, {}).update(dict.fromkeys(job.jira_tickets))
+            repo_jobs.setdefault(repo, []).append(job)
+    
+    logger.info(f"Planning batch of {len(jobs)} jobs: {len(all_tickets)} unique tickets across {len(repo_tickets)} repositories")
+    
+    jira_tickets_content, failed_tickets = fetch_jira_tickets(all_tickets, deadline)
+    
+    headers = github_headers()
+    
+    def collect(repo):
+        jobs_for_repo = repo_jobs[repo]
+        since_values = [to_github_timestamp(job.since) for job in jobs_for_repo]
+        until_values = [to_github_timestamp(job.until) for job in jobs_for_repo]
         try:
-            jira_content = fetch_jira_ticket_content(
-                JIRA_BASE_URL,
-                JIRA_EMAIL,
-                JIRA_TOKEN,
-                ticket_key
+            return collect_repo_changes(
+                repo,
+                list(repo_tickets[repo]),
+                headers,
+                since=min(since_values) if all(since_values) else None,
+                until=max(until_values) if all(until_values) else None,
+                stop_when_matched=all(job.stop_when_matched for job in jobs_for_repo),
+                deadline=deadline
             )
-            jira_tickets_content.append(jira_content)
-            logger.info(f"Successfully fetched JIRA ticket content: {ticket_key} - {jira_content['summary']}")
-        except Exception as e:
-            logger.error(f"Failed to fetch JIRA ticket {ticket_key}: {str(e)}")
-            failed_tickets.append(ticket_key)
+        except HTTPException as e:
+            logger.error(f"Failed to collect changes for {repo}: {e.detail}")
+            return e
     
-    if not jira_tickets_content:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch any JIRA tickets. Failed tickets: {', '.join(failed_tickets)}")
+    repos = list(repo_tickets)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(repos), settings.max_repo_workers))) as executor:
+        repo_results = dict(zip(repos, executor.map(collect, repos)))
     
-    # Continue with GitHub commit fetching
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
+    return {
+        "tickets": {ticket['key']: ticket for ticket in jira_tickets_content},
+        "failed_tickets": set(failed_tickets),
+        "repo_changes": repo_results
     }
-    commits_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{data.repo}/commits"
-    all_commits = []
+
+def run_batch_job(index: int, job: BatchReleaseNoteJob, plan, deadline: Optional[Deadline] = None):
+    """
+    Generate the release note of one batch job from the shared batch data
+    """
+    job_id = job.job_id or str(index)
+    try:
+        repos = job.repo_list()
+        ticket_keys = list(dict.fromkeys(job.jira_tickets))
+        jira_tickets_content = [plan["tickets"][key] for key in ticket_keys if key in plan["tickets"]]
+        failed_tickets = [key for key in ticket_keys if key in plan["failed_tickets"]]
+        
+        if not jira_tickets_content:
+            raise HTTPException(status_code=500, detail=f"Failed to fetch any JIRA tickets. Failed tickets: {', '.join(failed_tickets)}")
+        
+        repo_changes = []
+        for repo in repos:
+            changes = plan["repo_changes"][repo]
+            if isinstance(changes, HTTPException):
+                raise changes
+            repo_changes.append(select_repo_changes_for_tickets(
+                changes, job.jira_tickets, to_github_timestamp(job.since), to_github_timestamp(job.until)
+            ))
+        
+        populated_prompt = build_release_note_prompt(jira_tickets_content, repo_changes, prompt_template_name(job, repos))
+        release_note = call_openai_with_prompt(populated_prompt, deadline)
+        
+        logger.info(f"Batch job {job_id} finished")
+        return {
+            "job_id": job_id,
+            **project_fields(
+                build_release_note_response(release_note, job.jira_tickets, jira_tickets_content, failed_tickets, repos, repo_changes),
+                job.fields,
+                always=("success",)
+            )
+        }
+    except HTTPException as e:
+        logger.error(f"Batch job {job_id} failed: {e.detail}")
+        return {
+            "job_id": job_id,
+            "success": False,
+            "status_code": e.status_code,
+            "error": e.detail
+        }
+    except DeadlineExceeded:
+        logger.error(f"Batch job {job_id} ran out of time")
+        return {
+            "job_id": job_id,
+            "success": False,
+            "status_code": 504,
+            "error": "Request deadline exceeded before upstream calls finished."
+        }
+
+def run_release_note_batch(jobs: List[BatchReleaseNoteJob], plan, deadline: Optional[Deadline] = None):
+    """
+    Run the OpenAI step of every batch job concurrently, yielding results as each job finishes
+    """
+    # The executor bounds this batch; openai_semaphore additionally caps calls across all requests
+    with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), settings.openai_max_concurrency))) as executor:
+        futures = [
+            executor.submit(run_batch_job, index, job, plan, deadline)
+            for index, job in enumerate(jobs)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+@app.post("/generate-release-notes/batch")
+def generate_release_notes_batch(data: BatchReleaseNoteRequest, request: Request):
+    """
+    Generate release notes for many (repositories, tickets) jobs in one call
+
+    JIRA and GitHub fetches are shared across jobs. With `stream` enabled the results are
+    streamed as NDJSON, one line per job in completion order; otherwise they are returned
+    together in job order.
+    """
+    logger.info(f"Received batch request with {len(data.jobs)} jobs")
+    
+    if not data.jobs:
+        raise HTTPException(status_code=400, detail="At least one job must be provided.")
+    job_ids = set()
+    for index, job in enumerate(data.jobs):
+        job_id = job.job_id or str(index)
+        if not job.repo_list():
+            raise HTTPException(status_code=400, detail=f"Job '{job_id}' has no repository in 'repo' or 'repos'.")
+        validate_template(job.template)
+        # Results are matched to their jobs by id, both here and by streaming clients
+        if job_id in job_ids:
+            raise HTTPException(status_code=400, detail=f"Duplicate job_id '{job_id}'; job ids default to the job's position.")
+        job_ids.add(job_id)
+    
+    require_settings("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN", "GITHUB_TOKEN", "GITHUB_OWNER", "OPENAI_API_KEY")
+    
+    deadline = request_deadline(data.deadline_seconds)
+    plan = plan_release_note_batch(data.jobs, deadline)
+    results = run_release_note_batch(data.jobs, plan, deadline)
+    
+    if data.stream:
+        # Compressed here rather than by GZipMiddleware, which would hold back lines until it
+        # fills a compression block
+        if accepts_gzip(request.headers.get("Accept-Encoding", "")):
+            return StreamingResponse(
+                gzip_ndjson_stream(results),
+                media_type="application/x-ndjson",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+            )
+        return StreamingResponse(
+            (dumps_json(result) + b"\n" for result in results),
+            media_type="application/x-ndjson"
+        )
+    
+    results_by_id = {result["job_id"]: result for result in results}
+    ordered_results = [results_by_id[job.job_id or str(index)] for index, job in enumerate(data.jobs)]
+    return JSONResponseClass({
+        "success": all(result["success"] for result in ordered_results),
+        "results": ordered_results,
+        "shared_fetches": {
+            "jira_tickets": len(plan["tickets"]) + len(plan["failed_tickets"]),
+            "repositories": len(plan["repo_changes"]),
+            "commit_diffs": sum(
+                len(changes["commit_diffs"]) for changes in plan["repo_changes"].values()
+                if not isinstance(changes, HTTPException)
+            )
+        }
+    })
+
+def verify_github_signature(body: bytes, signature_header: Optional[str]):
+    """Verify the X-Hub-Signature-256 header of a GitHub webhook delivery"""
+    # Unsigned deliveries could inject arbitrary commit messages into the index
+    require_settings("GITHUB_WEBHOOK_SECRET")
+    expected = "sha256=" + hmac.new(settings.github_webhook_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    if not signature_header or not hmac.compare_digest(expected, signature_header):
+        logger.error("GitHub webhook signature verification failed")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature.")
+
+def index_push_event(payload: dict):
+    """
+    Index the ticket-prefixed commits of a GitHub push event to the default branch
+    """
+    repository = payload.get("repository") or {}
+    repo = repository.get("name")
+    owner = (repository.get("owner") or {}).get("login") or (repository.get("owner") or {}).get("name")
+    default_branch = repository.get("default_branch")
+    
+    if not repo or (settings.github_owner and (owner or "").lower() != settings.github_owner.lower()):
+        return {"success": True, "indexed": 0, "message": f"Ignored push for repository '{owner}/{repo}'"}
+    if default_branch and payload.get("ref") != f"refs/heads/{default_branch}":
+        return {"success": True, "indexed": 0, "message": f"Ignored push to non-default ref '{payload.get('ref')}'"}
+    
+    commits = [
+        (c.get("id"), c.get("message", ""), c.get("timestamp"))
+        for c in payload.get("commits", [])
+        # Not filtered on `distinct`: the commits of a merged branch are non-distinct in the
+        # default-branch push, and re-indexing a commit is idempotent
+        if c.get("id")
+    ]
+    indexed = commit_index.add_commits(repo, commits)
+    logger.info(f"Indexed {indexed} of {len(commits)} pushed commits for {repo}")
+    return {"success": True, "repository": repo, "indexed": indexed}
+
+@app.post("/webhooks/github")
+async def github_webhook(request: Request):
+    """
+    Receive GitHub push webhooks and feed the ticket -> commit index
+    """
+    body = await request.body()
+    verify_github_signature(body, request.headers.get("X-Hub-Signature-256"))
+    
+    event = request.headers.get("X-GitHub-Event", "")
+    logger.info(f"Received GitHub webhook event '{event}' (delivery {request.headers.get('X-GitHub-Delivery')})")
+    if event == "ping":
+        return {"success": True, "message": "pong"}
+    if event != "push":
+        return {"success": True, "indexed": 0, "message": f"Ignored event '{event}'"}
+    
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook payload is not valid JSON.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Webhook payload must be a JSON object.")
+    
+    return await run_in_threadpool(index_push_event, payload)
+
+def commit_index_is_fresh(repo: str) -> bool:
+    """Whether the repository was synced within COMMIT_INDEX_MAX_AGE_SECONDS"""
+    last_synced_at = commit_index.get_last_synced_at(repo)
+    if not last_synced_at or settings.commit_index_max_age_seconds <= 0:
+        return False
+    synced_at = datetime.strptime(last_synced_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - synced_at).total_seconds() < settings.commit_index_max_age_seconds
+
+def sync_repo_commit_index(repo: str, full: bool = False, deadline: Optional[Deadline] = None,
+                           budget: Optional[RequestBudget] = None):
+    """
+    Index the commits of a repository since its last sync (all of them if `full` is set)
+
+    Returns:
+        dict: Sync summary (commits fetched and indexed, whether the history was complete)
+    """
+    last_synced_at = None if full else commit_index.get_last_synced_at(repo)
+    since = None
+    if last_synced_at:
+        # GitHub filters `since` by commit date, so commits dated before the last sync but
+        # pushed or merged after it are only caught by re-reading an overlap window
+        synced_at = datetime.strptime(last_synced_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        since = to_github_timestamp(synced_at - timedelta(seconds=settings.commit_index_sync_overlap_seconds))
+    sync_started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    commits_url = f"{settings.github_api_url}/repos/{settings.github_owner}/{repo}/commits"
+    params = {"per_page": 100}
+    if since:
+        params["since"] = since
+    
+    logger.info(f"Syncing commit index for {repo} since {since or 'the beginning'}")
+    headers = github_headers()
     page = 1
+    fetched = 0
+    indexed = 0
+    complete = False
+    try:
+        while page <= settings.commit_index_max_sync_pages:
+            resp = upstream_get(commits_url, deadline, budget, headers=headers, params={**params, "page": page})
+            if resp.status_code != 200:
+                logger.error(f"Failed to fetch commits from GitHub for {repo}: {resp.text}")
+                raise HTTPException(status_code=resp.status_code, detail=f"Failed to fetch commits from GitHub for '{repo}'.")
+            batch = resp.json()
+            fetched += len(batch)
+            indexed += commit_index.add_commits(repo, (
+                (c['sha'], c['commit']['message'], c['commit'].get('committer', {}).get('date'))
+                for c in batch
+            ))
+            if len(batch) < 100:
+                complete = True
+                break
+            page += 1
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Network error while syncing commit index: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Network error connecting to GitHub: {str(e)}")
+    
+    if not complete:
+        logger.warning(f"[{repo}] Sync stopped after {settings.commit_index_max_sync_pages} pages; older commits were not indexed")
+    commit_index.set_last_synced_at(repo, sync_started_at)
+    
+    logger.info(f"Commit index sync for {repo} finished: {indexed} of {fetched} commits indexed")
+    return {
+        "success": True,
+        "repository": f"{settings.github_owner}/{repo}",
+        "since": since,
+        "commits_fetched": fetched,
+        "commits_indexed": indexed,
+        "complete": complete,
+        "last_synced_at": sync_started_at
+    }
 
-    # Fetch all commits with pagination (up to 1000 commits)
-    logger.info("Fetching commits from GitHub...")
-    while True:
-        resp = requests.get(commits_url, headers=headers, params={"per_page": 100, "page": page})
-        logger.info(f"Requested page {page} of commits. Status: {resp.status_code}")
-        if resp.status_code != 200:
-            logger.error(f"Failed to fetch commits from GitHub: {resp.text}")
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch commits from GitHub.")
-        batch = resp.json()
-        if not batch:
-            logger.info("No more commits found, ending pagination.")
-            break
-        all_commits.extend(batch)
-        if len(batch) < 100:
-            logger.info("Last page of commits reached.")
-            break
-        page += 1
-        if page > 10:
-            logger.warning("Hard limit of 1000 commits reached, stopping pagination to prevent abuse.")
+@app.post("/commit-index/sync/{repo}")
+def sync_commit_index(repo: str, full: bool = False):
+    """
+    Backfill the commit index of a repository
+
+    Only commits since the last sync are fetched unless `full` is set.
+    """
+    require_settings("GITHUB_TOKEN", "GITHUB_OWNER")
+    return sync_repo_commit_index(repo, full)
+
+def fetch_prewarm_tickets(budget: RequestBudget):
+    """
+    Search JIRA with PREWARM_JQL and normalize the matching tickets like fetch_jira_ticket_content
+
+    Returns:
+        list: Ticket data, at most PREWARM_MAX_TICKETS
+    """
+    search_url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/search/jql"
+    headers = jira_auth_headers(settings.jira_email, settings.jira_token)
+    tickets = []
+    next_page_token = None
+    while len(tickets) < settings.prewarm_max_tickets:
+        params = {
+            "jql": settings.prewarm_jql,
+            "fields": JIRA_ISSUE_FIELDS,
+            "maxResults": min(100, settings.prewarm_max_tickets - len(tickets))
+        }
+        if next_page_token:
+            params["nextPageToken"] = next_page_token
+        response = upstream_get(search_url, budget=budget, headers=headers, params=params)
+        if response.status_code != 200:
+            logger.error(f"JIRA search for prewarming failed with status {response.status_code}: {response.text}")
+            raise HTTPException(status_code=response.status_code, detail=f"JIRA search failed: {response.text}")
+        result = response.json()
+        issues = result.get("issues", [])
+        tickets.extend(normalize_jira_issue(issue) for issue in issues)
+        # Enhanced search pages by token and reports no total
+        next_page_token = result.get("nextPageToken")
+        if not issues or result.get("isLast") or not next_page_token:
             break
+    return tickets[:settings.prewarm_max_tickets]
 
-    logger.info(f"Total commits fetched: {len(all_commits)}")
+def prewarm_repositories(budget: RequestBudget):
+    """The watched repositories: PREWARM_REPOS, else the most recently updated repositories of the owner"""
+    repos = settings.prewarm_repo_list()
+    if repos:
+        return repos
+    repo_list = cache.get_or_set(
+        f"github:repos:{settings.github_owner}",
+        lambda: fetch_repository_list(budget),
+        settings.cache_ttl_repositories
+    )
+    return [repo["name"] for repo in repo_list][:settings.prewarm_max_repos]
 
-    # Create patterns for all tickets and find matching commits
-    all_matching_commits = []
-    ticket_commit_count = {}
+def run_prewarm_cycle(force: bool = False):
+    """
+    Fetch ahead what release note generation needs, so its critical path is down to an
+    incremental commit index sync and the OpenAI call
+
+    Caches the active fix-version tickets (selected with PREWARM_JQL), backfills the commit
+    index of every watched repository and caches the diffs of the commits matching those tickets.
+    Each cycle stays within its JIRA and GitHub request budgets; with a shared cache only
+    one worker runs it per interval unless `force` is set.
+    """
+    missing_vars = settings.missing("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_TOKEN", "GITHUB_TOKEN", "GITHUB_OWNER")
+    if missing_vars:
+        return {"success": False, "error": f"Missing environment variables: {', '.join(missing_vars)}"}
+    if not force and not cache.add("prewarm:lease", os.getpid(), settings.prewarm_interval_seconds * 0.9):
+        logger.info("Prewarm cycle already run by another worker in this interval, skipping")
+        return {"success": True, "skipped": True}
     
-    for ticket_key in data.jira_tickets:
-        pattern = rf"^\[{re.escape(ticket_key)}\]"
-        matching_commits = [
-            c for c in all_commits if re.match(pattern, c['commit']['message'])
-        ]
-        ticket_commit_count[ticket_key] = len(matching_commits)
-        all_matching_commits.extend(matching_commits)
-        logger.info(f"Found {len(matching_commits)} commits matching pattern '[{ticket_key}]'.")
-    
-    # Remove duplicates (in case a commit mentions multiple tickets)
-    unique_commits = {c['sha']: c for c in all_matching_commits}.values()
-    unique_commits = list(unique_commits)
-
-    result = []
-    for c in unique_commits:
-        sha = c['sha']
-        commit_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{data.repo}/commits/{sha}"
-        logger.info(f"Fetching diff for commit {sha}...")
-        commit_resp = requests.get(commit_url, headers=headers)
-        if commit_resp.status_code != 200:
-            logger.warning(f"Failed to fetch diff for commit {sha}: {commit_resp.text}")
-            continue
-        commit_data = commit_resp.json()
-        files = [
-            {
-                "filename": f.get("filename", ""),
-                "patch": f.get("patch", ""),
-            }
-            for f in commit_data.get("files", [])
-        ]
-        logger.info(f"Commit {sha}: {len(files)} files with diffs.")
-        result.append({
-            "sha": sha,
-            "message": c['commit']['message'],
-            "files": files
-        })
+    jira_budget = RequestBudget("JIRA", settings.prewarm_jira_request_budget, settings.prewarm_min_rate_limit_remaining)
+    github_budget = RequestBudget("GitHub", settings.prewarm_github_request_budget, settings.prewarm_min_rate_limit_remaining)
+    result = {"success": True, "tickets": 0, "repositories": 0, "commit_diffs": 0, "failed_repositories": []}
+    
+    try:
+        tickets = fetch_prewarm_tickets(jira_budget)
+        for ticket in tickets:
+            cache.set(f"jira:ticket:{ticket['key']}", ticket, settings.cache_ttl_jira_ticket)
+        result["tickets"] = len(tickets)
+        logger.info(f"Prewarmed {len(tickets)} JIRA tickets")
+        
+        ticket_keys = [ticket["key"] for ticket in tickets]
+        if ticket_keys:
+            headers = github_headers()
+            for repo in prewarm_repositories(github_budget):
+                try:
+                    if settings.prewarm_commit_index and not commit_index.is_synced(repo):
+                        # Backfill once, so neither later cycles nor generation paginate the
+                        # history; collect_repo_changes keeps synced repositories fresh
+                        sync_repo_commit_index(repo, budget=github_budget)
+                    changes = collect_repo_changes(repo, ticket_keys, headers, budget=github_budget)
+                except HTTPException as e:
+                    logger.error(f"Failed to prewarm {repo}: {e.detail}")
+                    result["failed_repositories"].append(repo)
+                    continue
+                result["repositories"] += 1
+                result["commit_diffs"] += len(changes["commit_diffs"])
+    except BudgetExhausted as e:
+        logger.warning(f"Prewarm cycle stopped early: {str(e)}")
+        result["budget_exhausted"] = str(e)
+    except HTTPException as e:
+        result.update(success=False, error=e.detail)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Network error while prewarming: {str(e)}")
+        result.update(success=False, error=str(e))
+    
+    result["jira_requests"] = jira_budget.used
+    result["github_requests"] = github_budget.used
+    logger.info(f"Prewarm cycle finished: {result}")
+    return result
 
-    logger.info(f"Returning {len(result)} commit diffs to client.")
+prewarm_scheduler = PrewarmScheduler(run_prewarm_cycle, settings.prewarm_interval_seconds)
+
+def start_prewarming():
+    if settings.prewarm_enabled:
+        if settings.prewarm_interval_seconds > settings.cache_ttl_jira_ticket:
+            logger.warning("PREWARM_INTERVAL_SECONDS exceeds CACHE_TTL_JIRA_TICKET: prewarmed tickets expire before the next cycle")
+        prewarm_scheduler.start()
+
+def stop_prewarming():
+    prewarm_scheduler.stop()
+
+@app.post("/prewarm/run")
+def run_prewarm():
+    """Run a prewarm cycle now and return its summary"""
+    return prewarm_scheduler.run_once(force=True)
+
+@app.get("/prewarm/status")
+def prewarm_status():
+    """Whether background prewarming is running, and the summary of its last cycle"""
     return {
-        "jira_tickets": jira_tickets_content,
-        "failed_tickets": failed_tickets,
-        "ticket_commit_counts": ticket_commit_count,
-        "commit_diffs": result
+        "enabled": settings.prewarm_enabled,
+        "running": prewarm_scheduler.running,
+        "interval_seconds": settings.prewarm_interval_seconds,
+        "last_run_at": prewarm_scheduler.last_run_at,
+        "last_result": prewarm_scheduler.last_result
     }
 
 @app.post("/send-release-email/")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Minimal OpenAI-compatible chat completions server with injected latency and errors
+
+Lets the deadline, hedging and fallback behavior be exercised locally without calling
+OpenAI. Start one stub per provider, then point the backend at them:
+
+    python openai_stub.py --port 8011 --latency 1 --slow-rate 0.1 --slow-latency 20
+    python openai_stub.py --port 8012 --latency 2
+    OPENAI_BASE_URL=http://localhost:8011/v1 OPENAI_API_KEY=stub \\
+    OPENAI_FALLBACK_BASE_URL=http://localhost:8012/v1 OPENAI_FALLBACK_MODEL=gpt-3.5-turbo \\
+    OPENAI_HEDGE_ENABLED=true uvicorn main:app
+"""
+import argparse
+import http.server
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+
+class ChatCompletionsHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            roll = server.random.random()
+            delay = server.latency + server.random.uniform(0, server.jitter)
+        if roll < server.slow_rate:
+            delay = server.slow_latency
+        time.sleep(delay)
+
+        if roll >= 1 - server.error_rate:
+            self.send_json(500, {"error": {"message": "Injected stub error", "type": "server_error"}})
+            return
+
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        content = f"# Release Notes\n\nStub release note from {request.get('model')} ({len(prompt)} prompt characters, {delay:.2f}s)."
+        self.send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": (len(prompt) + len(content)) // 4}
+        })
+
+class OpenAIStubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, latency=1.0, jitter=0.0, slow_rate=0.0, slow_latency=30.0, error_rate=0.0,
+                 seed=None, quiet=False):
+        super().__init__(address, ChatCompletionsHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.quiet = quiet
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def handle_error(self, request, client_address):
+        # Hedged and timed-out calls hang up before the injected latency has passed
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub with injected latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--latency", type=float, default=1.0, help="Base response time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests answered after --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=30.0, help="Response time of slow requests in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latency and errors")
+    args = parser.parse_args()
+
+    with OpenAIStubServer((args.host, args.port), args.latency, args.jitter, args.slow_rate, args.slow_latency,
+                          args.error_rate, args.seed) as server:
+        print(f"OpenAI stub listening on http://{args.host}:{args.port}/v1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
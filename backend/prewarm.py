@@ -0,0 +1,105 @@
+"""
+Background pre-warming
+
+A PrewarmScheduler runs a warm-up cycle in a background thread at a fixed interval, so
+upstream data is fetched ahead of the requests that need it. Each cycle spends
+RequestBudgets: a cap on the upstream requests it may make to a service, which also
+stops early when the service reports its own rate limit is nearly used up.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class BudgetExhausted(Exception):
+    """A cycle has used up its request budget for a service"""
+
+class RequestBudget:
+    """Upstream requests a cycle may still make to one service"""
+
+    def __init__(self, service: str, max_requests: int, min_rate_limit_remaining: int = 0):
+        self.service = service
+        self.max_requests = max_requests
+        self.min_rate_limit_remaining = min_rate_limit_remaining
+        self.used = 0
+        self.rate_limited = False
+        self._lock = threading.Lock()
+
+    def spend(self):
+        """
+        Account for one request about to be made
+
+        Raises:
+            BudgetExhausted: If the budget or the service's rate limit is used up
+        """
+        with self._lock:
+            if self.rate_limited:
+                raise BudgetExhausted(f"{self.service} rate limit is nearly used up")
+            if self.used >= self.max_requests:
+                raise BudgetExhausted(f"{self.service} request budget of {self.max_requests} is used up")
+            self.used += 1
+
+    def observe(self, response):
+        """Leave the rest of the service's rate limit to interactive requests once it runs low"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if response.status_code == 429 or (
+            remaining is not None and remaining.isdigit() and int(remaining) < self.min_rate_limit_remaining
+        ):
+            logger.warning(f"{self.service} rate limit is running low (remaining: {remaining}), pausing prewarming")
+            self.rate_limited = True
+
+class PrewarmScheduler:
+    """Runs `cycle` in a daemon thread every `interval` seconds until stopped"""
+
+    def __init__(self, cycle: Callable[..., dict], interval: float, initial_delay: float = 5.0):
+        self.cycle = cycle
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.last_result: Optional[dict] = None
+        self.last_run_at: Optional[str] = None
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prewarm", daemon=True)
+        self._thread.start()
+        logger.info(f"Prewarming every {self.interval:.0f}s")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self, **kwargs) -> dict:
+        """Run one cycle now (passing kwargs to it); scheduled and manual runs never overlap"""
+        with self._run_lock:
+            started = time.monotonic()
+            try:
+                result = self.cycle(**kwargs)
+            except Exception as e:
+                logger.exception("Prewarm cycle failed")
+                result = {"success": False, "error": str(e)}
+            result["duration_seconds"] = round(time.monotonic() - started, 3)
+            self.last_result = result
+            self.last_run_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            return result
+
+    def _run(self):
+        if self._stop.wait(self.initial_delay):
+            return
+        while True:
+            self.run_once()
+            if self._stop.wait(self.interval):
+                return
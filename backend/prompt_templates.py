@@ -0,0 +1,129 @@
+"""
+Prompt template registry
+
+Templates are read once, pre-split around their placeholders and re-read only when the
+file changes on disk. Teams can override the default template per repository or module
+by dropping a `<name>.txt` file into the overrides directory.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PromptTemplate:
+    """
+    A template pre-split into literal segments and placeholders
+
+    Rendering assembles the final prompt in a single join instead of one full-string
+    copy per placeholder.
+    """
+    __slots__ = ("path", "parts", "placeholder_positions")
+
+    def __init__(self, path: str, text: str, placeholders: List[str]):
+        self.path = path
+        pattern = "(" + "|".join(re.escape(p) for p in placeholders) + ")"
+        # re.split keeps the placeholders at the odd positions
+        self.parts = re.split(pattern, text)
+        self.placeholder_positions = [(i, self.parts[i]) for i in range(1, len(self.parts), 2)]
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Substitute every placeholder with its value"""
+        parts = list(self.parts)
+        for position, placeholder in self.placeholder_positions:
+            parts[position] = values.get(placeholder, placeholder)
+        return "".join(parts)
+
+class _CachedTemplate:
+    __slots__ = ("template", "mtime_ns", "size", "checked_at")
+
+    def __init__(self, template: PromptTemplate, mtime_ns: int, size: int, checked_at: float):
+        self.template = template
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checked_at = checked_at
+
+class PromptTemplateRegistry:
+    """
+    Loads and caches prompt templates, with per-repository/module overrides
+
+    Files are stat-ed at most once per `check_interval` seconds, so steady-state requests
+    do no disk I/O at all.
+    """
+
+    def __init__(self, default_path: str, overrides_dir: str, placeholders: List[str], check_interval: float = 2.0):
+        self.default_path = default_path
+        self.overrides_dir = overrides_dir
+        self.placeholders = placeholders
+        self.check_interval = check_interval
+        self._templates: Dict[str, _CachedTemplate] = {}
+        self._overrides: Dict[str, str] = {}
+        self._overrides_mtime_ns = None
+        self._overrides_checked_at = None
+        self._lock = threading.Lock()
+
+    def _refresh_overrides(self, now: float):
+        if self._overrides_checked_at is not None and now - self._overrides_checked_at < self.check_interval:
+            return
+        self._overrides_checked_at = now
+        try:
+            mtime_ns = os.stat(self.overrides_dir).st_mtime_ns
+        except OSError:
+            self._overrides = {}
+            self._overrides_mtime_ns = None
+            return
+        if mtime_ns == self._overrides_mtime_ns:
+            return
+        self._overrides = {
+            name[:-len(".txt")]: os.path.join(self.overrides_dir, name)
+            for name in os.listdir(self.overrides_dir)
+            if name.endswith(".txt")
+        }
+        self._overrides_mtime_ns = mtime_ns
+        logger.info(f"Found {len(self._overrides)} prompt template overrides in {self.overrides_dir}")
+
+    def _load(self, path: str, now: float) -> PromptTemplate:
+        cached = self._templates.get(path)
+        if cached is not None and now - cached.checked_at < self.check_interval:
+            return cached.template
+
+        stat = os.stat(path)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            cached.checked_at = now
+            return cached.template
+
+        with open(path, "r", encoding="utf-8") as f:
+            template = PromptTemplate(path, f.read(), self.placeholders)
+        self._templates[path] = _CachedTemplate(template, stat.st_mtime_ns, stat.st_size, now)
+        logger.info(f"Loaded prompt template {path}")
+        return template
+
+    def has_override(self, name: str) -> bool:
+        """Whether an override template exists for `name`"""
+        with self._lock:
+            self._refresh_overrides(time.monotonic())
+            return name in self._overrides
+
+    def get(self, name: Optional[str] = None) -> PromptTemplate:
+        """
+        Return the override template for `name` (a repository or module), or the default template
+
+        Raises:
+            FileNotFoundError: If the resolved template file does not exist
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._refresh_overrides(now)
+            path = self._overrides.get(name, self.default_path) if name else self.default_path
+            try:
+                return self._load(path, now)
+            except FileNotFoundError:
+                # An override deleted since the last listing falls back to the default
+                self._templates.pop(path, None)
+                if path == self.default_path:
+                    raise
+                self._overrides_checked_at = None
+                return self._load(self.default_path, now)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Minimal in-memory Redis-compatible server for local testing of the shared cache
+
+Supports the commands the cache uses (GET, SET with EX/PX/NX/XX, DEL and EVAL of the
+cache's compare-and-delete script) plus PING, AUTH, SELECT and FLUSHALL. Start it, then run several backend workers against it:
+
+    python redis_stand_in.py --port 6390
+    CACHE_BACKEND=redis CACHE_URL=redis://localhost:6390/0 uvicorn main:app --workers 4
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+from cache import DELETE_IF_SCRIPT
+
+class Store:
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()  # Inline command, e.g. from telnet
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return [args[0].decode()] + args[1:]
+
+    def reply(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, str):
+            self.wfile.write(f"+{value}\r\n".encode())
+        elif isinstance(value, Exception):
+            self.wfile.write(f"-ERR {value}\r\n".encode())
+        else:
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            name, args = command[0].upper(), command[1:]
+            with store.lock:
+                self.reply(self.execute(store, name, args))
+
+    def execute(self, store, name, args):
+        if name == "PING":
+            return "PONG"
+        if name in ("AUTH", "SELECT"):
+            return "OK"
+        if name == "FLUSHALL":
+            store.data.clear()
+            return "OK"
+        if name == "GET":
+            return store.get(args[0])
+        if name == "DEL":
+            return sum(1 for key in args if store.data.pop(key, None) is not None)
+        if name == "SET":
+            key, value, options = args[0], args[1], [a.decode().upper() for a in args[2:]]
+            expires_at = None
+            if "EX" in options:
+                expires_at = time.monotonic() + int(options[options.index("EX") + 1])
+            if "PX" in options:
+                expires_at = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            exists = store.get(key) is not None
+            if ("NX" in options and exists) or ("XX" in options and not exists):
+                return None
+            store.data[key] = (value, expires_at)
+            return "OK"
+        if name == "EVAL":
+            if args[0].decode() != DELETE_IF_SCRIPT:
+                return ValueError("only the cache's compare-and-delete script is supported")
+            key, value = args[2], args[3]
+            if store.get(key) != value:
+                return 0
+            del store.data[key]
+            return 1
+        return ValueError(f"unknown command '{name}'")
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, RESPHandler)
+        self.store = Store()
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory Redis-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    with RESPServer((args.host, args.port)) as server:
+        print(f"Redis stand-in listening on {args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
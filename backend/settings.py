@@ -0,0 +1,190 @@
+"""
+Backend settings
+
+Configuration is read from the environment (and the nearest `.env` file) once at startup
+into a typed Settings object. Each field is read from the environment variable of the
+same name in upper case; invalid values fail startup with a message naming the variable
+instead of surfacing on the first request that uses them.
+"""
+import os
+from dataclasses import dataclass, fields
+from typing import List, Mapping, Optional
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis", "none")
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+class SettingsError(ValueError):
+    """One or more environment variables have invalid values"""
+
+@dataclass(frozen=True)
+class Settings:
+    # JIRA, GitHub and OpenAI credentials
+    jira_token: Optional[str] = None
+    jira_email: Optional[str] = None
+    jira_base_url: Optional[str] = None
+    github_token: Optional[str] = None
+    github_owner: Optional[str] = None
+    github_api_url: str = "https://api.github.com"  # Override to point at a local stand-in
+    github_webhook_secret: Optional[str] = None
+    openai_api_key: Optional[str] = None
+
+    # Email
+    email_smtp_server: str = "smtp.gmail.com"
+    email_smtp_port: int = 587
+    email_password: Optional[str] = None  # App password for JIRA_EMAIL
+
+    # Prompt templates (relative paths are resolved against the backend directory)
+    prompt_template_path: str = "prompt.txt"
+    prompt_templates_dir: str = "prompts"  # Per-repo/module overrides: <name>.txt
+    prompt_template_check_interval: float = 2.0  # Seconds between file change checks
+
+    # Ticket -> commit index
+    commit_index_path: str = "commit_index.db"
+    commit_index_max_sync_pages: int = 100  # 100 commits per page
+    commit_index_max_age_seconds: float = 0.0  # Sync incrementally before a lookup once older; 0 always syncs
+    commit_index_sync_overlap_seconds: float = 86400.0  # Re-read this far before the last sync for late-merged commits
+
+    # Cache (memory, sqlite, redis or none)
+    cache_backend: str = "memory"
+    cache_url: Optional[str] = None  # SQLite path for sqlite, redis://host:port/db for redis
+    cache_ttl_jira_ticket: int = 300
+    cache_ttl_repositories: int = 600
+    cache_ttl_commit_diff: int = 86400  # Diffs of a SHA never change
+
+    # Response compression
+    response_gzip_min_size: int = 1024  # Bytes
+    response_gzip_level: int = 6
+
+    # Concurrency
+    max_repo_workers: int = 4  # Repositories fetched in parallel
+    max_jira_workers: int = 4  # JIRA tickets fetched in parallel
+    openai_max_concurrency: int = 4  # Concurrent OpenAI calls per process
+
+    # Timeouts, request deadlines, hedging and fallback
+    openai_model: str = "gpt-4-turbo-preview"  # Has 128k context window vs 8k for gpt-4
+    openai_base_url: Optional[str] = None  # Any OpenAI-compatible endpoint, e.g. openai_stub.py
+    openai_timeout_seconds: float = 120.0  # Per OpenAI attempt
+    upstream_timeout_seconds: float = 30.0  # Per JIRA/GitHub request
+    request_deadline_seconds: float = 0.0  # Whole request; 0 disables
+    openai_hedge_enabled: bool = False
+    openai_hedge_percentile: float = 95.0  # Hedge after this latency percentile
+    openai_hedge_default_delay: float = 30.0  # Until enough latencies are recorded
+    openai_hedge_min_delay: float = 2.0
+    openai_fallback_model: Optional[str] = None  # Used when the primary is slow or erroring
+    openai_fallback_base_url: Optional[str] = None  # Defaults to the primary provider
+    openai_fallback_api_key: Optional[str] = None  # Defaults to OPENAI_API_KEY
+
+    # Background prewarming of tickets, commit index and diffs
+    prewarm_enabled: bool = False
+    prewarm_interval_seconds: float = 900.0
+    prewarm_jql: str = "fixVersion in unreleasedVersions() ORDER BY updated DESC"  # Active fix-version tickets
+    prewarm_repos: Optional[str] = None  # Comma-separated; defaults to the /repositories listing
+    prewarm_max_repos: int = 20  # Most recently updated repositories when PREWARM_REPOS is not set
+    prewarm_max_tickets: int = 500
+    prewarm_commit_index: bool = True  # Backfill the commit index of watched repositories that were never synced
+    prewarm_jira_request_budget: int = 50  # Per cycle
+    prewarm_github_request_budget: int = 500  # Per cycle
+    prewarm_min_rate_limit_remaining: int = 1000  # Stop a cycle when the API reports fewer requests left
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """
+        Parse and validate the settings from environment variables
+
+        Unset and empty variables keep their defaults.
+
+        Raises:
+            SettingsError: Listing every variable with an invalid value
+        """
+        environ = os.environ if environ is None else environ
+        values = {}
+        errors = []
+        for field in fields(cls):
+            name = field.name.upper()
+            raw = environ.get(name, "").strip()
+            if not raw:
+                continue
+            try:
+                values[field.name] = _parse(raw, field.type)
+            except ValueError:
+                errors.append(f"{name}={raw!r} is not a valid {_type_name(field.type)}")
+
+        if "github_api_url" in values:
+            values["github_api_url"] = values["github_api_url"].rstrip("/")
+        if "cache_backend" in values:
+            values["cache_backend"] = values["cache_backend"].lower()
+
+        settings = cls(**values)
+        errors.extend(settings._validate())
+        if errors:
+            raise SettingsError(f"Invalid configuration: {'; '.join(errors)}")
+        return settings
+
+    def _validate(self) -> List[str]:
+        errors = []
+        if self.cache_backend not in CACHE_BACKENDS:
+            errors.append(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}")
+        if not 0 <= self.response_gzip_level <= 9:
+            errors.append("RESPONSE_GZIP_LEVEL must be between 0 and 9")
+        if not 0 < self.openai_hedge_percentile <= 100:
+            errors.append("OPENAI_HEDGE_PERCENTILE must be between 0 and 100")
+        for name in ("max_repo_workers", "max_jira_workers", "openai_max_concurrency", "commit_index_max_sync_pages",
+                     "prewarm_max_repos", "prewarm_max_tickets"):
+            if getattr(self, name) < 1:
+                errors.append(f"{name.upper()} must be at least 1")
+        for name in ("openai_timeout_seconds", "upstream_timeout_seconds", "prewarm_interval_seconds"):
+            if getattr(self, name) <= 0:
+                errors.append(f"{name.upper()} must be positive")
+        for name in ("request_deadline_seconds", "openai_hedge_default_delay", "openai_hedge_min_delay",
+                     "prompt_template_check_interval", "response_gzip_min_size", "commit_index_max_age_seconds",
+                     "commit_index_sync_overlap_seconds",
+                     "cache_ttl_jira_ticket", "cache_ttl_repositories", "cache_ttl_commit_diff",
+                     "prewarm_jira_request_budget", "prewarm_github_request_budget", "prewarm_min_rate_limit_remaining"):
+            if getattr(self, name) < 0:
+                errors.append(f"{name.upper()} must not be negative")
+        return errors
+
+    def prewarm_repo_list(self) -> List[str]:
+        """The repositories named in PREWARM_REPOS"""
+        return [repo.strip() for repo in (self.prewarm_repos or "").split(",") if repo.strip()]
+
+    def missing(self, *names: str) -> List[str]:
+        """Return the given environment variable names whose settings are not set"""
+        return [name for name in names if not getattr(self, name.lower())]
+
+def _parse(raw: str, field_type):
+    if field_type is bool:
+        if raw.lower() in TRUE_VALUES:
+            return True
+        if raw.lower() in FALSE_VALUES:
+            return False
+        raise ValueError(raw)
+    if field_type in (int, float):
+        return field_type(raw)
+    return raw
+
+def _type_name(field_type) -> str:
+    return {bool: "boolean", int: "integer", float: "number"}.get(field_type, "string")
+
+def load_env_file(start_dir: str) -> Optional[str]:
+    """
+    Load the nearest .env file, searching from start_dir upwards like load_dotenv()
+
+    python-dotenv is only imported when a file is found. Variables already set in the
+    environment take precedence.
+
+    Returns:
+        str: Path of the loaded file, or None if there is none
+    """
+    directory = os.path.abspath(start_dir)
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
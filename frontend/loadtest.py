@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local load test for the frontend server
+
+Runs concurrent keep-alive clients against a URL for a fixed duration and reports
+throughput and latency. With --compare, starts the single-threaded (--simple) and the
+threaded server from serve.py on free local ports and measures both, including a slow
+client that holds a connection open to show head-of-line blocking.
+
+Usage:
+    python loadtest.py --compare
+    python loadtest.py --url http://localhost:3000/ --concurrency 20 --duration 10 --gzip --revalidate
+"""
+import argparse
+import http.client
+import socket
+import threading
+import time
+import urllib.parse
+
+import serve
+
+def run_client(url, deadline, accept_gzip, revalidate, latencies, errors, stats):
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path or "/"
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    etag = None
+    while time.perf_counter() < deadline:
+        headers = {}
+        if accept_gzip:
+            headers["Accept-Encoding"] = "br, gzip"
+        if revalidate and etag:
+            headers["If-None-Match"] = etag
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status not in (200, 304):
+                errors.append(response.status)
+                continue
+            etag = response.getheader("ETag") or etag
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+        with stats["lock"]:
+            stats["bytes"] += len(body)
+            stats[response.status] = stats.get(response.status, 0) + 1
+    conn.close()
+
+def slow_client(host, port, hold_seconds):
+    """Open a connection and send a partial request, stalling the server's handler"""
+    sock = socket.create_connection((host, port))
+    sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n")
+    time.sleep(hold_seconds)
+    sock.close()
+
+def load_test(url, concurrency, duration, accept_gzip=False, revalidate=False, slow_clients=0):
+    latencies, errors = [], []
+    stats = {"lock": threading.Lock(), "bytes": 0}
+    parsed = urllib.parse.urlsplit(url)
+    slow_threads = [
+        threading.Thread(target=slow_client, args=(parsed.hostname, parsed.port, duration), daemon=True)
+        for _ in range(slow_clients)
+    ]
+    for thread in slow_threads:
+        thread.start()
+    time.sleep(0.1 if slow_clients else 0)
+
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(url, deadline, accept_gzip, revalidate, latencies, errors, stats), daemon=True)
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=duration + 35)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "kib_per_request": stats["bytes"] / 1024 / max(1, len(latencies)),
+        "not_modified": stats.get(304, 0),
+        "errors": len(errors),
+    }
+
+def report(label, result):
+    print(f"{label:<34} {result['requests']:>7} req  {result['rps']:>8.0f} req/s  "
+          f"p50 {result['p50_ms']:>6.1f} ms  p95 {result['p95_ms']:>7.1f} ms  "
+          f"{result['kib_per_request']:>6.1f} KiB/req  304s {result['not_modified']:>6}  errors {result['errors']}")
+
+def compare(concurrency, duration):
+    scenarios = [
+        ("plain", dict()),
+        ("gzip", dict(accept_gzip=True)),
+        ("revalidate (If-None-Match)", dict(accept_gzip=True, revalidate=True)),
+        ("plain + 1 slow client", dict(slow_clients=1)),
+    ]
+    for simple in (True, False):
+        server = serve.create_server(0, simple=simple, quiet=True)
+        port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        print(f"\n== {'single-threaded (--simple)' if simple else 'threaded (default)'} server on port {port} ==")
+        for name, options in scenarios:
+            report(name, load_test(f"http://127.0.0.1:{port}/", concurrency, duration, **options))
+        server.shutdown()
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the frontend server")
+    parser.add_argument("--url", default="http://localhost:3000/", help="URL to request")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds per scenario")
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: br, gzip")
+    parser.add_argument("--revalidate", action="store_true", help="Revalidate with If-None-Match after the first response")
+    parser.add_argument("--compare", action="store_true", help="Start both server modes locally and compare them")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.concurrency, args.duration)
+    else:
+        report(args.url, load_test(args.url, args.concurrency, args.duration, args.gzip, args.revalidate))
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,30 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server to serve the frontend files with proper CORS headers
+
+By default connections are handled concurrently with HTTP/1.1 keep-alive, responses are
+served gzip/brotli compressed when the client accepts it, and ETag/Last-Modified
+validators let browsers revalidate with a 304 instead of downloading the page again.
+Pass --simple to use the single-threaded server without caching or compression.
 """
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import io
 import os
+import socketserver
 import sys
+import threading
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MIN_COMPRESS_SIZE = 256
 
 class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
@@ -16,21 +35,200 @@ class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
 
     def do_OPTIONS(self):
         self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+class StaticFile:
+    """A file's content with its compressed variants and validators, built once per file version"""
+
+    def __init__(self, path, stat, content_type):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.content_type = content_type
+        self.last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        self.last_modified_ts = int(stat.st_mtime)
+        self.etag_base = hashlib.sha1(raw).hexdigest()[:16]
+        self.variants = {'identity': raw}
+
+        if content_type.startswith(COMPRESSIBLE_TYPES) and len(raw) >= MIN_COMPRESS_SIZE:
+            # Prefer precompressed files shipped next to the original, else compress once here
+            self.variants['gzip'] = self._precompressed(path, '.gz', stat) or gzip.compress(raw, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants['br'] = self._precompressed(path, '.br', stat) or brotli.compress(raw, quality=11)
+            elif os.path.exists(path + '.br'):
+                self.variants['br'] = self._precompressed(path, '.br', stat)
+            self.variants = {k: v for k, v in self.variants.items() if v is not None}
+
+    @staticmethod
+    def _precompressed(path, suffix, stat):
+        try:
+            variant_stat = os.stat(path + suffix)
+        except OSError:
+            return None
+        if variant_stat.st_mtime_ns < stat.st_mtime_ns:
+            return None  # Stale: older than the original
+        with open(path + suffix, 'rb') as f:
+            return f.read()
+
+    def etag(self, encoding):
+        return f'"{self.etag_base}"' if encoding == 'identity' else f'"{self.etag_base}-{encoding}"'
+
+class CachingHTTPRequestHandler(CORSHTTPRequestHandler):
+    """Serves files with keep-alive, precompressed variants, validators and Cache-Control"""
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY keep-alive responses
+    # stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    _files = {}
+    _files_lock = threading.Lock()
+
+    def _static_file(self, path):
+        stat = os.stat(path)
+        cached = self._files.get(path)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+        static_file = StaticFile(path, stat, self.guess_type(path))
+        with self._files_lock:
+            self._files[path] = static_file
+        return static_file
+
+    def _accepted_encoding(self, static_file):
+        accepted = {}
+        for token in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = token.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        for encoding in ('br', 'gzip'):
+            if encoding in static_file.variants and accepted.get(encoding, 0) > 0:
+                return encoding
+        return 'identity'
+
+    def _not_modified(self, static_file):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            if if_none_match.strip() == '*':
+                return True
+            tags = {tag.strip()[2:] if tag.strip().startswith('W/') else tag.strip() for tag in if_none_match.split(',')}
+            return any(static_file.etag(encoding) in tags for encoding in static_file.variants)
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since is not None and static_file.last_modified_ts <= since.timestamp()
+        return False
+
+    def _cache_control(self, static_file):
+        # HTML is revalidated on every load so deployments show up immediately
+        if static_file.content_type.startswith('text/html'):
+            return 'no-cache'
+        return 'public, max-age=3600'
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split('?', 1)[0].endswith('/'):
+                return super().send_head()  # Redirect to add the trailing slash
+            for index in ('index.html', 'index.htm'):
+                if os.path.isfile(os.path.join(path, index)):
+                    path = os.path.join(path, index)
+                    break
+            else:
+                return super().send_head()  # Directory listing
+        if not os.path.isfile(path):
+            self.send_error(404, "File not found")
+            return None
+
+        try:
+            static_file = self._static_file(path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+
+        encoding = self._accepted_encoding(static_file)
+        not_modified = self._not_modified(static_file)
+        if not_modified:
+            self.send_response(304)
+            self.send_header('ETag', static_file.etag(encoding))
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', static_file.content_type)
+            self.send_header('Content-Length', str(len(static_file.variants[encoding])))
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('ETag', static_file.etag(encoding))
+            self.send_header('Last-Modified', static_file.last_modified)
+        self.send_header('Cache-Control', self._cache_control(static_file))
+        if len(static_file.variants) > 1:
+            self.send_header('Vary', 'Accept-Encoding')
         self.end_headers()
 
+        if not_modified:
+            return None
+        return io.BytesIO(static_file.variants[encoding])
+
+class DisconnectTolerantMixin:
+    """Don't print tracebacks for clients that disconnect mid-response"""
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+class SimpleFrontendServer(DisconnectTolerantMixin, socketserver.TCPServer):
+    quiet = False
+
+class ThreadingFrontendServer(DisconnectTolerantMixin, http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+    quiet = False
+
+def create_server(port, simple=False, directory=None, quiet=False):
+    """Create the frontend server; `simple` selects the single-threaded legacy server"""
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    if simple:
+        handler = lambda *args, **kwargs: CORSHTTPRequestHandler(*args, directory=directory, **kwargs)
+        server = SimpleFrontendServer(("", port), handler)
+        server.quiet = quiet
+        return server
+    handler = lambda *args, **kwargs: CachingHTTPRequestHandler(*args, directory=directory, **kwargs)
+    server = ThreadingFrontendServer(("", port), handler)
+    server.quiet = quiet
+    return server
+
 def main():
+    parser = argparse.ArgumentParser(description="Serve the frontend")
+    parser.add_argument("port", nargs="?", default="3000", help="Port to listen on (default 3000)")
+    parser.add_argument("--simple", action="store_true", help="Single-threaded server without caching or compression")
+    args = parser.parse_args()
+
     port = 3000
-    if len(sys.argv) > 1:
-        try:
-            port = int(sys.argv[1])
-        except ValueError:
-            print(f"Invalid port: {sys.argv[1]}. Using default port 3000.")
-    
+    try:
+        port = int(args.port)
+    except ValueError:
+        print(f"Invalid port: {args.port}. Using default port 3000.")
+
     # Change to the directory containing this script
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
-    with socketserver.TCPServer(("", port), CORSHTTPRequestHandler) as httpd:
-        print(f"🚀 Frontend server running at http://localhost:{port}")
+
+    with create_server(port, simple=args.simple, directory=os.getcwd()) as httpd:
+        mode = "single-threaded" if args.simple else "threaded, compressed, cache-aware"
+        print(f"🚀 Frontend server running at http://localhost:{port} ({mode})")
         print(f"📁 Serving files from: {os.getcwd()}")
         print("Press Ctrl+C to stop the server")
         try:
@@ -39,4 +237,4 @@ def main():
             print("\n👋 Server stopped")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()